@@ -1,21 +1,14 @@
-from crewai import Agent
+from agents.role import Role
+
+class DevelopmentTeam(Role):
+    __slots__ = ("members", "velocity")
 
-class DevelopmentTeam(Agent):
     def __init__(self, name, members, velocity):
-        super().__init__(name=f"DevTeam-{name}")
+        super().__init__(name=f"DevTeam-{name}", role="Agile Team",
+                         goal="Deliver working software", backstory="Cross-functional team of developers and testers")
         self.members = members
         self.velocity = velocity
 
-    def complete_tasks(self, tasks):
-        completed_tasks = []
-        remaining_velocity = self.velocity
-
-        for task in tasks:
-            if task['estimated_effort'] <= remaining_velocity:
-                completed_tasks.append(task)
-                remaining_velocity -= task['estimated_effort']
-            else:
-                task['estimated_effort'] -= remaining_velocity
-                break
-
-        return completed_tasks
\ No newline at end of file
+    def complete_tasks(self, backlog, rows):
+        # Burn the team's velocity down over the given backlog rows in order
+        return backlog.burn_down(rows, self.velocity)
\ No newline at end of file
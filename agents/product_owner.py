@@ -1,9 +1,24 @@
-from crewai import Agent
+import numpy as np
+
+from agents.role import Role
+from utils.wsjf import WSJFQueue, priority_cost_of_delay, wsjf
+
+class ProductOwner(Role):
+    __slots__ = ()
 
-class ProductOwner(Agent):
     def __init__(self):
-        super().__init__(name="Product Owner")
+        super().__init__(name="Product Owner", role="Product Owner", goal="Maximize the value delivered",
+                         backstory="Owner of the team backlog")
     
-    def prioritize_backlog(self, backlog):
-        # Prioritize backlog items by business value and urgency
-        return sorted(backlog, key=lambda x: (x['priority'], -x['estimated_effort']))
\ No newline at end of file
+    def prioritize_backlog(self, backlog, by="priority"):
+        # Prioritize backlog items by business value and urgency, or by WSJF
+        if by == "wsjf":
+            score = wsjf(priority_cost_of_delay(backlog.priority), backlog.estimated_effort)
+            order = np.lexsort((np.arange(len(backlog)), -score))
+        else:
+            order = np.lexsort((-backlog.estimated_effort.astype(np.int64), backlog.priority))
+        return backlog.take(order)
+
+    def wsjf_queue(self, backlog, rows=None, cost_of_delay=None):
+        # For planning loops that re-prioritize after every change: O(log n) updates, no re-sorts
+        return WSJFQueue.from_backlog(backlog, rows, cost_of_delay)
@@ -0,0 +1,46 @@
+import threading
+from collections import OrderedDict
+
+
+class Role:
+    """Rule-based SAFe role.
+
+    The workflows only need the rules, so roles are plain slotted objects,
+    pooled with `pooled`/`for_team` and reused across workflows. Pooled
+    instances are shared between threads, so they hold no per-call or
+    per-team state; the pool keeps the `pool_size` most recently used ones.
+    """
+
+    __slots__ = ("name", "role", "goal", "backstory")
+
+    # Shared instances, keyed by class and constructor arguments, least recently used first
+    _pool = OrderedDict()
+    _pool_lock = threading.Lock()
+    pool_size = 1024
+
+    def __init__(self, name, role, goal, backstory):
+        self.name = name
+        self.role = role
+        self.goal = goal
+        self.backstory = backstory
+
+    @classmethod
+    def pooled(cls, *args, key=None):
+        """The shared instance of this role for `key`, by default the (hashable) constructor arguments."""
+        key = (cls, args if key is None else key)
+        with Role._pool_lock:
+            instance = Role._pool.get(key)
+            if instance is not None:
+                Role._pool.move_to_end(key)
+                return instance
+        instance = cls(*args)
+        with Role._pool_lock:
+            instance = Role._pool.setdefault(key, instance)
+            while len(Role._pool) > Role.pool_size:
+                Role._pool.popitem(last=False)
+        return instance
+
+    @staticmethod
+    def clear_pool():
+        with Role._pool_lock:
+            Role._pool.clear()
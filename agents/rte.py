@@ -1,52 +1,74 @@
-from crewai import Agent
-from pydantic import BaseModel
-
-class ReleaseTrainEngineer(Agent, BaseModel):
-    role: str
-    goal: str
-    backstory: str
-
-    def __init__(self, role: str, goal: str, backstory: str):
-        super().__init__(name="RTE")  # This calls the parent class constructor
-        self.role = role
-        self.goal = goal
-        self.backstory = backstory
-
-    def assign_feature(self, feature, teams):
-        # Assign features based on team capacity
-        for team in teams:
-            if team['capacity'] >= feature['estimated_effort']:
-                team['capacity'] -= feature['estimated_effort']
-                feature['assigned_team'] = team['name']
-                return team
-        raise Exception("No team has enough capacity for this feature!")
+import numpy as np
+
+from agents.role import Role
+from utils.assignment import UNASSIGNED, assign_features
+from utils.backlog import NO_DEPENDENCY
+from utils.event_log import get_event_log
+
+class ReleaseTrainEngineer(Role):
+    __slots__ = ()
+
+    def __init__(self, role: str = "RTE", goal: str = "Deliver value",
+                 backstory: str = "Experienced RTE with a history of successful PI planning"):
+        super().__init__(name="RTE", role=role, goal=goal, backstory=backstory)
+
+    def assign_feature(self, backlog, row, teams, strategy="first_fit"):
+        # Assign a single feature; returns None when no team has capacity
+        assigned, _ = self.assign_features(backlog, [row], teams, strategy)
+        return assigned[0]
+
+    def assign_features(self, backlog, rows, teams, strategy="first_fit"):
+        # Assign a batch of features based on team capacity.
+        # Returns the team (or None) per row and the ids left unassigned.
+        rows = np.asarray(rows, dtype=np.int64)
+        assignment, remaining = assign_features(
+            backlog.estimated_effort[rows],
+            [team['capacity'] for team in teams],
+            strategy=strategy,
+        )
+        for team, capacity in zip(teams, remaining.tolist()):
+            team['capacity'] = capacity
+
+        placed = assignment != UNASSIGNED
+        codes = np.asarray([backlog.team_code(team['name']) for team in teams], dtype=np.int32)
+        backlog.update(rows[placed], assigned_team=codes[assignment[placed]])
+
+        assigned = [teams[a] if a != UNASSIGNED else None for a in assignment.tolist()]
+        return assigned, backlog.id[rows[~placed]].tolist()
 
     def identify_dependencies(self, backlog):
         # Identify dependencies between features
-        dependencies = []
-        for item in backlog:
-            if "depends_on" in item:
-                dependencies.append((item['id'], item['depends_on']))
-        return dependencies
+        rows = np.flatnonzero(backlog.depends_on != NO_DEPENDENCY)
+        return list(zip(backlog.id[rows].tolist(), backlog.depends_on[rows].tolist()))
 
-    def resolve_risks(self, risks):
-        for risk in risks:
-            print(f"Resolved risk for team: {risk['team']}")
+    def resolve_risks(self, risks, log=None):
+        log = log or get_event_log()
+        if risks and log.enabled("risk_resolved"):
+            log.emit_batch("risk_resolved", team=[risk['team'] for risk in risks],
+                           blocker=[risk.get('blocker') for risk in risks])
 
     def evaluate_performance(self, teams, progress):
-        # Calculate team velocity and delivery rates
-        metrics = []
-        for team in teams:
-            completed = sum(item['progress'] for item in progress if item['team'] == team['name'])
-            metrics.append({
-                "team": team['name'],
-                "velocity": completed / team['capacity']
-            })
-        return metrics
-
-    def provide_recommendations(self, metrics):
+        # Calculate team velocity and delivery rates with one group-by over progress
+        index = {team['name']: i for i, team in enumerate(teams)}
+        progress = [item for item in progress if item['team'] in index]
+        codes = np.fromiter((index[item['team']] for item in progress), dtype=np.int64, count=len(progress))
+        # Effort delivered against what the team plans per sprint; 'capacity' is only what planning left
+        delivered = np.fromiter((item.get('points', item['progress']) for item in progress), dtype=np.float64,
+                                count=len(progress))
+        completed = np.bincount(codes, weights=delivered, minlength=len(teams))
+        planned = np.asarray([team['velocity'] for team in teams], dtype=np.float64)
+        velocity = np.divide(completed, planned, out=np.zeros(len(teams)), where=planned > 0)
+        return [{"team": team['name'], "velocity": float(v)} for team, v in zip(teams, velocity.tolist())]
+
+    def provide_recommendations(self, metrics, threshold=0.75, drop=1.0):
+        # Flag low velocity ratios, and with rolling history, unpredictable or slowing teams
         recommendations = []
         for metric in metrics:
-            if metric['velocity'] < 0.75:
+            if metric['velocity'] < threshold:
                 recommendations.append(f"Increase capacity for team {metric['team']}")
+            if metric.get('sprints', 0) > 1 and metric['predictability'] < threshold:
+                recommendations.append(f"Improve commitment reliability for team {metric['team']}")
+            if metric.get('sprints', 0) > 1 and \
+                    metric['rolling_velocity'] < metric['velocity_mean'] - drop * metric['velocity_std']:
+                recommendations.append(f"Investigate falling velocity for team {metric['team']}")
         return recommendations
\ No newline at end of file
@@ -1,14 +1,21 @@
-from crewai import Agent
+from agents.role import Role
 
-class ScrumMaster(Agent):
-    def __init__(self, team):
-        super().__init__(name=f"ScrumMaster-{team['name']}")
-        self.team = team
+class ScrumMaster(Role):
+    __slots__ = ()
 
-    def run_standup(self):
+    @classmethod
+    def for_team(cls, team):
+        # One pooled Scrum Master per team name; the team record itself is passed to run_standup
+        return cls.pooled(team['name'])
+
+    def __init__(self, team_name):
+        super().__init__(name=f"ScrumMaster-{team_name}", role="Scrum Master",
+                         goal="Facilitate the team's ceremonies", backstory="Servant leader of an agile team")
+
+    def run_standup(self, team):
         # Gather team updates and identify blockers
         blockers = []
-        for member in self.team['members']:
+        for member in team['members']:
             if "blocker" in member:
-                blockers.append({"team": self.team['name'], "blocker": member['blocker']})
+                blockers.append({"team": team['name'], "blocker": member['blocker']})
         return blockers
\ No newline at end of file
@@ -1,41 +1,111 @@
+import copy
+
 import streamlit as st
+from agents.rte import ReleaseTrainEngineer
 from workflows.pi_planning import run_pi_planning
 from workflows.daily_standup import run_daily_standup
 from workflows.sprint_execution import execute_sprint
 from workflows.inspect_adapt import run_inspect_and_adapt
+from workflows.forecasting import forecast_pi
 from utils.generate_data import generate_backlog
+from utils.backlog import Backlog
+from utils.database import record_sprint_progress
+
+# Backlogs are keyed by content so unchanged stages hit the cache
+BACKLOG_HASH = {Backlog: Backlog.fingerprint}
+
+
+# Cached stages ================================================================
+# Each stage is memoized on its inputs across reruns and sessions. Stages copy
+# what they mutate so cached values are never changed in place.
+@st.cache_resource
+def get_rte():
+    return ReleaseTrainEngineer.pooled()
+
+
+@st.cache_data
+def load_backlog(size, seed, team_names):
+    return Backlog.from_frame(generate_backlog(size, seed=seed), teams=list(team_names))
+
+
+@st.cache_data(hash_funcs=BACKLOG_HASH)
+def plan_pi(backlog, teams):
+    return run_pi_planning(backlog.copy(), copy.deepcopy(teams), rte=get_rte())
+
+
+@st.cache_data(hash_funcs=BACKLOG_HASH)
+def forecast(teams, backlog, runs, seed):
+    return forecast_pi(teams, backlog, runs=runs, seed=seed)
+
+
+@st.cache_data
+def standup(teams):
+    return run_daily_standup(teams, rte=get_rte())
+
+
+@st.cache_data(hash_funcs=BACKLOG_HASH)
+def run_sprint(teams, backlog, seed):
+    return execute_sprint(teams, backlog.copy(), rng=seed)
+
+
+@st.cache_data(hash_funcs=BACKLOG_HASH)
+def inspect_and_adapt(teams, sprint_progress, backlog):
+    return run_inspect_and_adapt(teams, sprint_progress, backlog, rte=get_rte())
+
 
 # Generate synthetic data
 teams = [
     {"name": "Team A", "capacity": 30, "velocity": 10, "members": [{"name": "Alice"}, {"name": "Bob"}]},
     {"name": "Team B", "capacity": 25, "velocity": 12, "members": [{"name": "Charlie"}, {"name": "Eve"}]}
 ]
-backlog = generate_backlog().to_dict('records')
+
+with st.sidebar:
+    st.header("Simulation Controls")
+    backlog_size = st.number_input("Backlog items", min_value=1, value=50, step=50)
+    seed = st.number_input("Seed", min_value=0, value=0, step=1)
+
+backlog = load_backlog(int(backlog_size), int(seed), tuple(team['name'] for team in teams))
 
 st.title("SAFe Simulation Dashboard")
 
 # PI Planning
 st.header("PI Planning")
-backlog, teams, dependencies = run_pi_planning(backlog, teams)
+backlog, teams, dependencies, board = plan_pi(backlog, teams)
 st.write("Dependencies Identified:")
 st.write(dependencies)
+st.write("Program Board (features per sprint):")
+st.dataframe(board.to_frame())
+
+# Monte Carlo forecast of the planned PI
+st.header("PI Forecast")
+pi_forecast = forecast(teams, backlog, 10_000, int(seed))
+st.metric("Probability of completing all features", f"{pi_forecast['pi_completion_probability']:.0%}")
+st.write("Feature Finish Sprints:")
+st.dataframe(pi_forecast["features"])
+st.write("Team PI Velocity Distribution:")
+st.dataframe(pi_forecast["velocity"])
 
 # Daily Standup
 st.header("Daily Standup")
-blockers = run_daily_standup(teams)
+blockers = standup(teams)
 st.write("Blockers Identified:")
 st.write(blockers)
 
 # Sprint Execution
 st.header("Sprint Execution")
-backlog, sprint_progress = execute_sprint(teams, backlog)
+backlog, sprint_progress = run_sprint(teams, backlog, int(seed))
+# Written outside the cached stage so cache hits are recorded too, once per session and input
+recorded = st.session_state.setdefault("recorded_sprints", set())
+if (int(backlog_size), int(seed)) not in recorded:
+    record_sprint_progress(sprint_progress, run_id=f"dashboard-{seed}", pi=1, sprint=1)
+    recorded.add((int(backlog_size), int(seed)))
 st.write("Sprint Progress:")
 st.write(sprint_progress)
 
 # Inspect & Adapt
 st.header("Inspect & Adapt")
-metrics, recommendations = run_inspect_and_adapt(teams, sprint_progress)
+metrics, recommendations = inspect_and_adapt(teams, sprint_progress, backlog)
 st.write("Performance Metrics:")
 st.write(metrics)
 st.write("Recommendations:")
-st.write(recommendations)
\ No newline at end of file
+st.write(recommendations)
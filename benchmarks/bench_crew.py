@@ -0,0 +1,69 @@
+"""End-to-end crew timings against a deterministic local fake LLM server.
+
+    python -m benchmarks.bench_crew --tasks 1 4 16 --latency 0.05
+"""
+import argparse
+import itertools
+import os
+import sys
+
+# Keep telemetry and the response cache out of the measurements
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ["SAFE_LLM_CACHE"] = "off"
+
+from crewai import LLM, Agent, Crew, Process, Task
+
+from benchmarks.common import add_arguments, measure, report
+from benchmarks.fake_llm_server import FakeLLMServer
+from utils.crew_dag import run_task_dag
+
+TASKS = (1, 4, 16)
+MODES = ("kickoff", "task_dag")
+
+
+def build_crew(base_url, num_tasks):
+    llm = LLM(model="openai/fake-model", base_url=base_url, api_key="fake")
+    agents = [
+        Agent(role=f"Agile Team {i + 1}", goal="Deliver working software",
+              backstory="Cross-functional team", llm=llm, verbose=False)
+        for i in range(num_tasks)
+    ]
+    tasks = [
+        Task(description=f"Plan and execute sprint work for team {i + 1}",
+             expected_output="Sprint summary", agent=agent)
+        for i, agent in enumerate(agents)
+    ]
+    return agents, tasks
+
+
+def crew_pipeline(timer, base_url, tasks, mode):
+    agents, task_list = timer.stage("build", build_crew, base_url, tasks)
+    if mode == "kickoff":
+        crew = Crew(agents=agents, tasks=task_list, process=Process.sequential, verbose=False)
+        timer.stage("kickoff", crew.kickoff)
+    else:
+        timer.stage("task_dag", run_task_dag, task_list)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=TASKS)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake LLM waits per request")
+    parser.add_argument("--baseline", default="crew", help="baseline name under benchmarks/baselines")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    rows = []
+    with FakeLLMServer(latency=args.latency) as server:
+        for tasks, mode in itertools.product(args.tasks, args.modes):
+            print(f"tasks={tasks} mode={mode}", file=sys.stderr)
+            for row in measure(crew_pipeline, repeat=args.repeat, base_url=server.base_url, tasks=tasks, mode=mode):
+                del row["base_url"]
+                rows.append({**row, "latency": args.latency})
+    return report(args.baseline, rows, ("tasks", "mode", "latency", "stage"), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Cold start to first paint of each Streamlit entry point, one fresh interpreter per run.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --entry-points app.py pages/safe_simulator.py --repeat 5
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import add_arguments, report
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("crewai", "langchain_openai", "ollama", "litellm", "altair")
+
+# Runs inside the child interpreter; streamlit's own import is reported separately
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+loaded = time.perf_counter()
+app = AppTest.from_file(sys.argv[1], default_timeout=float(sys.argv[2])).run()
+painted = time.perf_counter()
+print(json.dumps({
+    "import_streamlit": loaded - start,
+    "first_paint": painted - loaded,
+    "heavy_imports": [m for m in sys.argv[3].split(",") if m in sys.modules],
+    "error": bool(app.exception),
+}))
+"""
+
+
+def entry_points():
+    return ["app.py", "main.py"] + sorted(os.path.relpath(p, ROOT) for p in glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def probe(entry_point, timeout=120.0):
+    # Pages read the key at import time; a placeholder keeps them from failing before first paint
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "placeholder"),
+           "PYTHONPATH": ROOT, "SAFE_LLM_CACHE": "off"}
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, os.path.join(ROOT, entry_point), str(timeout), ",".join(HEAVY_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout * 2,
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode or not lines:
+        raise RuntimeError(f"{entry_point} failed to start:\n{result.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entry-points", nargs="+", default=None)
+    parser.add_argument("--baseline", default="startup", help="baseline name under benchmarks/baselines")
+    add_arguments(parser, min_delta=0.1)
+    args = parser.parse_args(argv)
+
+    rows = []
+    for entry_point in args.entry_points or entry_points():
+        print(entry_point, file=sys.stderr)
+        runs = [probe(entry_point) for _ in range(args.repeat)]
+        for stage in ("import_streamlit", "first_paint"):
+            rows.append({
+                "entry_point": entry_point,
+                "stage": stage,
+                "seconds": min(run[stage] for run in runs),
+                "heavy_imports": ",".join(runs[0]["heavy_imports"]),
+                "error": runs[0]["error"],
+            })
+    return report(args.baseline, rows, ("entry_point", "stage"), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Time and peak memory of each workflow stage over a grid of team and backlog sizes.
+
+    python -m benchmarks.bench_workflows --quick
+    python -m benchmarks.bench_workflows --teams 2 100 1000 --items 50 100000 1000000 --save-baseline
+"""
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+
+# Events are still emitted and written, just not into the project's own log
+os.environ.setdefault("SAFE_EVENT_LOG", os.path.join(tempfile.gettempdir(), "safe_bench_events.jsonl"))
+
+from agents.rte import ReleaseTrainEngineer
+from benchmarks.common import add_arguments, measure, report
+from utils.backlog import Backlog
+from utils.generate_data import generate_backlog
+from workflows.daily_standup import run_daily_standup
+from workflows.inspect_adapt import run_inspect_and_adapt
+from workflows.pi_planning import run_pi_planning
+from workflows.sprint_execution import execute_sprint
+
+TEAMS = (2, 10, 100, 1_000)
+ITEMS = (50, 1_000, 100_000, 1_000_000)
+QUICK_TEAMS = (2, 10)
+QUICK_ITEMS = (50, 1_000)
+
+
+def make_teams(num_teams, items, members=5):
+    # Enough total capacity for roughly the whole feature backlog; every tenth member is blocked
+    capacity = max(30, 2 * items // num_teams)
+    return [
+        {
+            "name": f"Team {i + 1}",
+            "capacity": capacity,
+            "velocity": max(10, capacity // 5),
+            "members": [
+                {"name": f"Member {i + 1}.{j + 1}", **({"blocker": "Waiting on review"} if (i * members + j) % 10 == 0 else {})}
+                for j in range(members)
+            ],
+        }
+        for i in range(num_teams)
+    ]
+
+
+def workflow_pipeline(timer, teams, items, seed=0):
+    team_list = make_teams(teams, items)
+    rte = ReleaseTrainEngineer.pooled()
+    frame = timer.stage("generate_backlog", generate_backlog, items, seed=seed)
+    backlog = timer.stage("Backlog.from_frame", Backlog.from_frame, frame, teams=[team['name'] for team in team_list])
+    backlog, team_list, _, _ = timer.stage("run_pi_planning", run_pi_planning, backlog, team_list, rte=rte)
+    timer.stage("run_daily_standup", run_daily_standup, team_list, rte=rte)
+    backlog, progress = timer.stage("execute_sprint", execute_sprint, team_list, backlog, rng=seed)
+    timer.stage("run_inspect_and_adapt", run_inspect_and_adapt, team_list, progress, backlog, rte=rte)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, nargs="+", default=TEAMS)
+    parser.add_argument("--items", type=int, nargs="+", default=ITEMS)
+    parser.add_argument("--quick", action="store_true", help=f"teams {QUICK_TEAMS} x items {QUICK_ITEMS}")
+    parser.add_argument("--baseline", default="workflows", help="baseline name under benchmarks/baselines")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.teams, args.items = QUICK_TEAMS, QUICK_ITEMS
+
+    rows = []
+    for teams, items in itertools.product(args.teams, args.items):
+        print(f"teams={teams} items={items}", file=sys.stderr)
+        rows.extend(measure(workflow_pipeline, repeat=args.repeat, teams=teams, items=items))
+    return report(args.baseline, rows, ("teams", "items", "stage"), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
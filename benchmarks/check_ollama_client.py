@@ -0,0 +1,102 @@
+"""Check OllamaClient's caching, retries and pooling against the local fake Ollama server.
+
+    python -m benchmarks.check_ollama_client
+    python -m benchmarks.check_ollama_client --llm   # also a crewai LLM call against the server
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import requests
+
+from benchmarks.fake_ollama_server import FakeOllamaServer
+from utils.ollama_client import OllamaClient
+
+TTL, FAILURE_TTL = 0.5, 0.1
+
+
+def check_health_cache(server, client):
+    assert client.is_healthy() and client.is_healthy()
+    assert server.requests.get("/") == 1, "health is cached within the TTL"
+    time.sleep(TTL + 0.05)
+    assert client.is_healthy()
+    assert server.requests["/"] == 2, "health is fetched again once the TTL expires"
+
+
+def check_failure_retry(server, client):
+    client.invalidate()
+    server.fail_next = 1
+    assert client.list_models() is None
+    assert client.list_models() is None, "a failure is cached for failure_ttl"
+    assert server.requests["/api/tags"] == 1
+    time.sleep(FAILURE_TTL + 0.05)
+    assert client.has_model("qwen2.5"), "the next call after failure_ttl retries and recovers"
+    assert not client.has_model("mistral")
+    assert server.requests["/api/tags"] == 2
+
+
+def check_warm_up(server, client):
+    server.fail_next = 1
+    client.warm_up("qwen2.5", background=False)
+    assert "qwen2.5" not in server.loaded
+    client.warm_up("qwen2.5", keep_alive="10m", background=False)
+    assert server.loaded.get("qwen2.5") == "10m", "a failed warm-up is retried with keep_alive"
+    client.warm_up("qwen2.5", background=False)
+    assert server.requests["/api/generate"] == 2, "warm-up is a no-op within the TTL"
+    client.warm_up("llama3.2", background=True).join()
+    assert "llama3.2" in server.loaded
+
+
+def check_pooling(server, client):
+    # Everything above ran sequentially, so it fits one pooled connection
+    assert server.connections == 1, f"expected one keep-alive connection, saw {server.connections}"
+
+
+def check_chat(server, client):
+    body = {"model": "qwen2.5", "messages": [{"role": "user", "content": "Plan the PI"}]}
+    reply = requests.post(server.base_url + "/api/chat", json={**body, "stream": False}).json()
+    assert reply["done"] and reply["message"]["content"].startswith("Thought:")
+    streamed = requests.post(server.base_url + "/api/chat", json=body)
+    chunks = [line for line in streamed.iter_lines() if line]
+    content = "".join(json.loads(chunk)["message"]["content"] for chunk in chunks)
+    assert content == reply["message"]["content"], "streamed chunks add up to the full answer"
+
+
+def check_llm(server, client):
+    os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+    os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+    from crewai import LLM
+
+    answer = LLM(model="ollama/qwen2.5", base_url=server.base_url).call("Plan the PI")
+    assert "Final Answer: Outcome" in answer, answer
+
+
+CHECKS = {"health_cache": check_health_cache, "failure_retry": check_failure_retry, "warm_up": check_warm_up,
+          "pooling": check_pooling, "chat": check_chat, "llm": check_llm}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm", action="store_true", help="also call the server through crewai's LLM")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    with FakeOllamaServer() as server:
+        client = OllamaClient(server.base_url, ttl=TTL, failure_ttl=FAILURE_TTL)
+        for name, check in CHECKS.items():
+            if name == "llm" and not args.llm:
+                continue
+            try:
+                check(server, client)
+                print(f"ok   {name}")
+            except Exception as e:
+                failed += 1
+                print(f"FAIL {name}: {e}")
+        client.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
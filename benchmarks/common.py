@@ -0,0 +1,116 @@
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+TOLERANCE = 0.25
+# Slowdowns smaller than this many seconds are timer and scheduler noise, whatever their ratio
+MIN_DELTA = 0.005
+
+
+class StageTimer:
+    """Wall time and peak traced memory per named stage.
+
+    Stages are timed on every repeat and the fastest run is kept. Peak
+    memory comes from one extra pass under tracemalloc, which is kept out
+    of the timings because tracing slows Python-heavy code down.
+    """
+
+    def __init__(self, tracing=False):
+        self.tracing = tracing
+        self.seconds = {}
+        self.peak_mb = {}
+
+    def stage(self, name, fn, *args, **kwargs):
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            if self.tracing:
+                tracemalloc.start()
+                try:
+                    result = fn(*args, **kwargs)
+                    self.peak_mb[name] = tracemalloc.get_traced_memory()[1] / 2**20
+                finally:
+                    tracemalloc.stop()
+                return result
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+        self.seconds[name] = min(elapsed, self.seconds.get(name, float("inf")))
+        return result
+
+
+def measure(pipeline, repeat=3, **params):
+    """Run `pipeline(timer, **params)` `repeat` times plus one traced pass; one row per stage."""
+    timer = StageTimer()
+    for _ in range(repeat):
+        pipeline(timer, **params)
+    traced = StageTimer(tracing=True)
+    pipeline(traced, **params)
+    return [
+        {**params, "stage": name, "seconds": seconds, "peak_mb": traced.peak_mb.get(name)}
+        for name, seconds in timer.seconds.items()
+    ]
+
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save_baseline(name, rows):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), "w") as f:
+        json.dump({"machine": platform.platform(), "python": platform.python_version(), "results": rows}, f, indent=1)
+
+
+def compare_baseline(name, rows, keys, tolerance=TOLERANCE, min_delta=MIN_DELTA):
+    """Rows with `baseline_seconds`/`ratio`/`regression` added; None when no baseline exists.
+
+    A stage regresses when it is more than `tolerance` slower than the
+    baseline and also more than `min_delta` seconds slower.
+    """
+    try:
+        with open(baseline_path(name)) as f:
+            baseline = json.load(f)["results"]
+    except FileNotFoundError:
+        return None
+    previous = {tuple(row[k] for k in keys): row for row in baseline}
+    compared = []
+    for row in rows:
+        old = previous.get(tuple(row[k] for k in keys))
+        ratio = row["seconds"] / old["seconds"] if old and old["seconds"] > 0 else None
+        compared.append({
+            **row,
+            "baseline_seconds": old["seconds"] if old else None,
+            "ratio": ratio,
+            "regression": ratio is not None and ratio > 1 + tolerance and row["seconds"] - old["seconds"] > min_delta,
+        })
+    return compared
+
+
+def add_arguments(parser, min_delta=MIN_DELTA):
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the fastest is kept")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="slowdown over the baseline reported as a regression, e.g. 0.25 for 25%%")
+    parser.add_argument("--min-delta", type=float, default=min_delta,
+                        help="seconds a stage must also lose before it counts as a regression")
+
+
+def report(name, rows, keys, args):
+    """Print results (against the baseline if there is one); returns the process exit code."""
+    import pandas as pd
+
+    compared = compare_baseline(name, rows, keys, args.tolerance, args.min_delta)
+    frame = pd.DataFrame(compared or rows)
+    print(frame.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    if args.save_baseline:
+        save_baseline(name, rows)
+        print(f"Baseline saved to {baseline_path(name)}")
+        return 0
+    if compared is not None and frame["regression"].any():
+        print(f"{int(frame['regression'].sum())} stage(s) slower than baseline by more than {args.tolerance:.0%} "
+              f"and {args.min_delta * 1000:g} ms")
+        return 1
+    return 0
@@ -0,0 +1,166 @@
+"""Deterministic Ollama-shaped server for exercising OllamaClient and crews without a model.
+
+Serves the endpoints the Ollama pages use: `/` for health, `/api/tags`,
+`/api/generate` (an empty prompt only loads the model, like `warm_up`),
+`/api/chat` with NDJSON streaming, and the OpenAI-compatible
+`/v1/chat/completions` that crewai's LLM calls. Answers are derived from a
+hash of the request. `fail_next` makes the next requests return 503 and
+`connections` counts TCP connections, so callers can check retries and
+keep-alive pooling.
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MODELS = ("qwen2.5:latest", "llama3.2:latest")
+CREATED_AT = "2024-01-01T00:00:00Z"
+
+
+class FakeOllamaServer:
+    def __init__(self, models=MODELS, latency=0.0, host="127.0.0.1", port=0):
+        self.models = list(models)
+        self.latency = latency
+        self.requests = {}
+        self.connections = 0
+        self.loaded = {}
+        self.fail_next = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                if server._count(self.path):
+                    return self._send({"error": "service unavailable"}, 503)
+                if self.path == "/":
+                    return self._send_text("Ollama is running")
+                if self.path == "/api/tags":
+                    return self._send(server.tags())
+                self._send({"error": "not found"}, 404)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if server._count(self.path):
+                    return self._send({"error": "service unavailable"}, 503)
+                if self.path not in ("/api/generate", "/api/chat", "/v1/chat/completions"):
+                    return self._send({"error": "not found"}, 404)
+                model = body.get("model", "")
+                if model not in server.models and f"{model}:latest" not in server.models:
+                    return self._send({"error": f"model '{model}' not found"}, 404)
+                with server._lock:
+                    server.loaded[model] = body.get("keep_alive", "5m")
+                if server.latency:
+                    time.sleep(server.latency)
+                if self.path == "/v1/chat/completions":
+                    return self._send_openai(server.completion(body), body.get("stream", False))
+                chunks = server.generate(body) if self.path == "/api/generate" else server.chat(body)
+                if body.get("stream", True):
+                    self._send_stream(chunks)
+                else:
+                    self._send(chunks[-1])
+
+            def _send(self, payload, status=200):
+                self._write(status, "application/json", json.dumps(payload).encode())
+
+            def _send_text(self, text):
+                self._write(200, "text/plain; charset=utf-8", text.encode())
+
+            def _send_stream(self, chunks):
+                data = "".join(json.dumps(chunk) + "\n" for chunk in chunks).encode()
+                self._write(200, "application/x-ndjson", data)
+
+            def _send_openai(self, completion, stream):
+                if not stream:
+                    return self._send(completion)
+                choice = completion["choices"][0]
+                chunk = {**completion, "object": "chat.completion.chunk",
+                         "choices": [{"index": 0, "delta": choice["message"], "finish_reason": "stop"}]}
+                data = f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n".encode()
+                self._write(200, "text/event-stream", data)
+
+            def _write(self, status, content_type, data):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.base_url = f"http://{host}:{self.httpd.server_port}"
+
+    def _count(self, path):
+        # Whether this request should fail
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            if self.fail_next:
+                self.fail_next -= 1
+                return True
+        return False
+
+    def tags(self):
+        return {"models": [
+            {"name": name, "model": name, "modified_at": CREATED_AT, "size": 0,
+             "digest": hashlib.sha256(name.encode()).hexdigest(),
+             "details": {"format": "gguf", "family": name.split(":")[0]}}
+            for name in self.models
+        ]}
+
+    def answer(self, prompt):
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:16]
+        return f"Thought: I now know the final answer\nFinal Answer: Outcome {digest}"
+
+    def _chunks(self, body, prompt, key, wrap):
+        # Word-sized chunks followed by the closing record that carries the token counts
+        if not prompt:
+            return [{"model": body["model"], "created_at": CREATED_AT, key: wrap(""), "done": True,
+                     "done_reason": "load"}]
+        content = self.answer(prompt)
+        words = content.split(" ")
+        chunks = [{"model": body["model"], "created_at": CREATED_AT, key: wrap(word + " " * (i < len(words) - 1)),
+                   "done": False} for i, word in enumerate(words)]
+        final = {"model": body["model"], "created_at": CREATED_AT, key: wrap(""), "done": True,
+                 "done_reason": "stop", "prompt_eval_count": len(prompt) // 4, "eval_count": len(content) // 4}
+        if not body.get("stream", True):
+            final[key] = wrap(content)
+        return chunks + [final]
+
+    def generate(self, body):
+        return self._chunks(body, body.get("prompt", ""), "response", lambda text: text)
+
+    def chat(self, body):
+        prompt = json.dumps(body.get("messages", []), sort_keys=True) if body.get("messages") else ""
+        return self._chunks(body, prompt, "message", lambda text: {"role": "assistant", "content": text})
+
+    def completion(self, body):
+        prompt = json.dumps(body.get("messages", []), sort_keys=True)
+        content = self.answer(prompt)
+        prompt_tokens, completion_tokens = len(prompt) // 4, len(content) // 4
+        return {
+            "id": f"chatcmpl-{hashlib.sha256(prompt.encode()).hexdigest()[:16]}",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, name="fake-ollama", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        return False
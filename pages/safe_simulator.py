@@ -1,8 +1,10 @@
+import functools
 import streamlit as st
-from crewai import Agent, Task, Crew, Process
-from crewai.tools import BaseTool
 import os
 from dotenv import load_dotenv
+from utils.crew_dag import cached_run_task_dag
+from utils.crew_stream import enable_streaming, stream_to
+from utils.llm_cache import cached_kickoff
 
 load_dotenv()
 
@@ -10,20 +12,30 @@ load_dotenv()
 os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
 # 1. Define Tools =============================================================
-class JiraTool(BaseTool):
-    name: str = "Jira Tool"
-    description: str = "Manages user stories, tasks, and sprint backlogs."
-    def _run(self, task: str, assignee: str) -> str:
-        return f"Task '{task}' created and assigned to {assignee}."
+# crewai takes seconds to import, so the tool classes are defined on first use
+@functools.lru_cache(maxsize=None)
+def tool_classes():
+    from crewai.tools import BaseTool
 
-class DocumentationTool(BaseTool):
-    name: str = "Documentation Tool"
-    description: str = "Stores SAFe artifacts and team decisions."
-    def _run(self, content: str) -> str:
-        return f"Documentation updated: {content}"
+    class JiraTool(BaseTool):
+        name: str = "Jira Tool"
+        description: str = "Manages user stories, tasks, and sprint backlogs."
+        def _run(self, task: str, assignee: str) -> str:
+            return f"Task '{task}' created and assigned to {assignee}."
+
+    class DocumentationTool(BaseTool):
+        name: str = "Documentation Tool"
+        description: str = "Stores SAFe artifacts and team decisions."
+        def _run(self, content: str) -> str:
+            return f"Documentation updated: {content}"
+
+    return JiraTool, DocumentationTool
 
 # 2. Create SAFe Agents =======================================================
 def create_safe_agents():
+    from crewai import Agent
+
+    JiraTool, DocumentationTool = tool_classes()
     return {
         "RTE": Agent(
             role="Release Train Engineer",
@@ -57,32 +69,38 @@ def create_safe_agents():
 
 # 3. Define SAFe Tasks =======================================================
 def create_safe_tasks(agents):
-    return [
-        Task(
-            description="Facilitate PI Planning event with all teams",
-            expected_output="PI Objectives and Program Board",
-            agent=agents["RTE"],
-            tools=[JiraTool(), DocumentationTool()]
-        ),
-        Task(
-            description="Prioritize features based on strategic themes",
-            expected_output="Prioritized feature backlog with business value",
-            agent=agents["Product Manager"],
-            tools=[DocumentationTool()]
-        ),
-        Task(
-            description="Execute sprint: plan, daily scrums, demo, retrospective",
-            expected_output="Sprint backlog and working software increment",
-            agent=agents["Dev Team"],
-            tools=[JiraTool()]
-        ),
-        Task(
-            description="Identify and resolve cross-team dependencies",
-            expected_output="Dependency map and mitigation plan",
-            agent=agents["Scrum Master"],
-            tools=[JiraTool()]
-        )
-    ]
+    from crewai import Task
+
+    JiraTool, DocumentationTool = tool_classes()
+    pi_planning = Task(
+        description="Facilitate PI Planning event with all teams",
+        expected_output="PI Objectives and Program Board",
+        agent=agents["RTE"],
+        tools=[JiraTool(), DocumentationTool()]
+    )
+    prioritization = Task(
+        description="Prioritize features based on strategic themes",
+        expected_output="Prioritized feature backlog with business value",
+        agent=agents["Product Manager"],
+        tools=[DocumentationTool()]
+    )
+    # context declares what each task needs; prioritization and dependency
+    # resolution don't depend on each other and can run side by side
+    sprint = Task(
+        description="Execute sprint: plan, daily scrums, demo, retrospective",
+        expected_output="Sprint backlog and working software increment",
+        agent=agents["Dev Team"],
+        tools=[JiraTool()],
+        context=[pi_planning, prioritization]
+    )
+    dependencies = Task(
+        description="Identify and resolve cross-team dependencies",
+        expected_output="Dependency map and mitigation plan",
+        agent=agents["Scrum Master"],
+        tools=[JiraTool()],
+        context=[pi_planning]
+    )
+    return [pi_planning, prioritization, sprint, dependencies]
 
 # 4. Streamlit UI =============================================================
 def main():
@@ -92,25 +110,41 @@ def main():
     st.title("🚀 SAFe Implementation Simulator")
     st.markdown("Simulate a SAFe Agile Release Train using AI Agents")
     
+    # Task output streams in here while the crew runs
+    live_output = st.container()
+    
     # Simulation Controls
     with st.sidebar:
         st.header("Simulation Controls")
+        bypass_cache = st.checkbox("Bypass LLM cache", value=False)
+        concurrent = st.checkbox("Run independent tasks concurrently", value=True)
+        max_parallel = st.number_input("Max concurrent LLM calls", min_value=1, max_value=16, value=2)
+        stream_output = st.checkbox("Stream output as it arrives", value=True)
         if st.button("Run SAFe Simulation"):
             with st.spinner("Running PI Planning and Sprint Execution..."):
                 # Create agents and tasks
                 agents = create_safe_agents()
                 tasks = create_safe_tasks(agents)
                 
-                # Create and run crew
-                safe_crew = Crew(
-                    agents=list(agents.values()),
-                    tasks=tasks,
-                    process=Process.sequential,
-                    verbose=True
-                )
+                if concurrent:
+                    run = lambda: cached_run_task_dag(tasks, bypass=bypass_cache, default_limit=max_parallel)
+                else:
+                    from crewai import Crew, Process
+
+                    safe_crew = Crew(
+                        agents=list(agents.values()),
+                        tasks=tasks,
+                        process=Process.sequential,
+                        verbose=True
+                    )
+                    run = lambda: cached_kickoff(safe_crew, bypass=bypass_cache)
                 
                 # Store results in session state
-                st.session_state.results = safe_crew.kickoff()
+                if stream_output:
+                    enable_streaming(agents.values())
+                    st.session_state.results = stream_to(live_output, run, tasks)
+                else:
+                    st.session_state.results = run()
     
     # Results Visualization
     if "results" in st.session_state:
@@ -1,29 +1,38 @@
 # safe_simulator_ollama.py
+import functools
 import streamlit as st
-from crewai import Agent, Task, Crew, Process, LLM
-from crewai.tools import BaseTool
-import ollama
-import requests
 import os
 import time
+from contextlib import nullcontext
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
+from utils.backlog import Backlog
+from utils.crew_dag import cached_run_task_dag
+from utils.crew_stream import enable_streaming, stream_to
+from utils.llm_cache import cached_kickoff
+from utils.generate_data import generate_backlog
+from utils.ollama_client import OLLAMA_URL, OllamaClient
+from utils.tracing import CrewTracer, load_spans, span_summary
+from workflows.sprint_execution import execute_sprint
+from workflows.team_ceremonies import CEREMONY_FIELDS, run_batched_ceremony
 
 load_dotenv()
 
 # Validation functions
+@st.cache_resource
+def get_ollama_client():
+    # One pooled client per server process, shared across reruns and sessions
+    return OllamaClient(OLLAMA_URL)
+
 def validate_ollama_server():
     """Check if Ollama server is running"""
-    try:
-        response = requests.get("http://localhost:11434", timeout=10)
-        return response.status_code == 200
-    except requests.ConnectionError:
-        return False
+    return get_ollama_client().is_healthy()
 
 def validate_model_available(model_name: str):
     """Check if specified model is available locally"""
     try:
-        models = ollama.list()['models']
-        return any(m['model'].startswith(model_name) for m in models)
+        return get_ollama_client().has_model(model_name)
     except Exception as e:
         st.error(f"Model validation failed: {str(e)}")
         return False
@@ -35,26 +44,36 @@ def assert_safe_setup(agents, tasks):
     assert all(agent.tools for agent in agents.values()), "All agents must have tools assigned"
 
 # 1. Define Tools =============================================================
-class JiraTool(BaseTool):
-    name: str = "Jira Tool"
-    description: str = "Manages user stories and sprint backlogs."
-    def _run(self, task: str, assignee: str) -> str:
-        assert isinstance(task, str), "Task must be a string"
-        assert isinstance(assignee, str), "Assignee must be a string"
-        return f"Task '{task}' created and assigned to {assignee}."
-
-class DocumentationTool(BaseTool):
-    name: str = "Documentation Tool"
-    description: str = "Stores SAFe artifacts."
-    def _run(self, content: str) -> str:
-        assert len(content) > 10, "Content must be at least 10 characters"
-        return f"Documentation updated: {content}"
+# crewai takes seconds to import, so the tool classes are defined on first use
+@functools.lru_cache(maxsize=None)
+def tool_classes():
+    from crewai.tools import BaseTool
+
+    class JiraTool(BaseTool):
+        name: str = "Jira Tool"
+        description: str = "Manages user stories and sprint backlogs."
+        def _run(self, task: str, assignee: str) -> str:
+            assert isinstance(task, str), "Task must be a string"
+            assert isinstance(assignee, str), "Assignee must be a string"
+            return f"Task '{task}' created and assigned to {assignee}."
+
+    class DocumentationTool(BaseTool):
+        name: str = "Documentation Tool"
+        description: str = "Stores SAFe artifacts."
+        def _run(self, content: str) -> str:
+            assert len(content) > 10, "Content must be at least 10 characters"
+            return f"Documentation updated: {content}"
+
+    return JiraTool, DocumentationTool
 
 # 2. Create SAFe Agents =======================================================
 def create_safe_agents(model_name: str):
+    from crewai import Agent, LLM
+
+    JiraTool, DocumentationTool = tool_classes()
     llm = LLM(
-        base_url="http://localhost:11434",
-        model="ollama/llama3.2",
+        base_url=OLLAMA_URL,
+        model=f"ollama/{model_name}",
         temperature=0.3,
         top_k=20
     )
@@ -91,29 +110,65 @@ def create_safe_agents(model_name: str):
 
 # 3. Define SAFe Tasks =======================================================
 def create_safe_tasks(agents):
-    return [
-        Task(
-            description="Facilitate PI Planning event with all teams",
-            expected_output="PI Objectives and Program Board",
-            agent=agents["RTE"],
-            tools=[JiraTool(), DocumentationTool()],
-            async_execution=False
-        ),
-        Task(
-            description="Prioritize features based on strategic themes",
-            expected_output="Prioritized feature backlog",
-            agent=agents["Product Manager"],
-            tools=[DocumentationTool()],
-            async_execution=False
-        ),
-        Task(
-            description="Execute sprint: plan, daily scrums, demo",
-            expected_output="Working software increment",
-            agent=agents["Dev Team"],
-            tools=[JiraTool()],
-            async_execution=False
-        )
+    from crewai import Task
+
+    JiraTool, DocumentationTool = tool_classes()
+    # PI planning and prioritization are independent; the sprint needs both
+    pi_planning = Task(
+        description="Facilitate PI Planning event with all teams",
+        expected_output="PI Objectives and Program Board",
+        agent=agents["RTE"],
+        tools=[JiraTool(), DocumentationTool()],
+        async_execution=False
+    )
+    prioritization = Task(
+        description="Prioritize features based on strategic themes",
+        expected_output="Prioritized feature backlog",
+        agent=agents["Product Manager"],
+        tools=[DocumentationTool()],
+        async_execution=False
+    )
+    sprint = Task(
+        description="Execute sprint: plan, daily scrums, demo",
+        expected_output="Working software increment",
+        agent=agents["Dev Team"],
+        tools=[JiraTool()],
+        async_execution=False,
+        context=[pi_planning, prioritization]
+    )
+    return [pi_planning, prioritization, sprint]
+
+def create_ceremony_agent(model_name: str):
+    from crewai import Agent, LLM
+
+    return Agent(
+        role="Scrum Master",
+        goal="Facilitate team ceremonies and surface impediments",
+        backstory="Servant leader coaching many agile teams",
+        verbose=False,
+        llm=LLM(base_url=OLLAMA_URL, model=f"ollama/{model_name}", temperature=0.3, top_k=20),
+        max_iter=2
+    )
+
+def create_ceremony_teams(num_teams: int, seed: int = 0):
+    # Synthetic teams with a few blocked members and one executed sprint
+    rng = np.random.default_rng(seed)
+    teams = [
+        {
+            "name": f"Team {i + 1}",
+            "capacity": 30,
+            "velocity": int(rng.integers(8, 15)),
+            "members": [
+                {"name": f"Member {i + 1}.{j + 1}", **({"blocker": "Waiting on environment"} if rng.random() < 0.15 else {})}
+                for j in range(3)
+            ],
+        }
+        for i in range(num_teams)
     ]
+    backlog = Backlog.from_frame(generate_backlog(num_teams * 10, seed=seed), teams=[team['name'] for team in teams])
+    backlog.update(slice(None), assigned_team=np.arange(len(backlog)) % num_teams)
+    backlog, progress = execute_sprint(teams, backlog, rng=rng)
+    return teams, progress
 
 # 4. Streamlit UI =============================================================
 def main():
@@ -123,6 +178,9 @@ def main():
     st.title("🚀 Local SAFe Simulator with Ollama")
     st.markdown("Simulate SAFe using local LLMs (Llama 3.2/Qwen 2.5)")
     
+    # Task output streams in here while the crew runs
+    live_output = st.container()
+    
     # Model selection
     selected_model = st.sidebar.selectbox(
         "Select LLM",
@@ -138,8 +196,17 @@ def main():
     if not validate_model_available(selected_model):
         st.error(f"Model {selected_model} not found! Install with `ollama pull {selected_model}`")
         return
+
+    # Load the model while the user is still setting up the run
+    get_ollama_client().warm_up(selected_model)
     
     # Simulation Controls
+    bypass_cache = st.sidebar.checkbox("Bypass LLM cache", value=False)
+    concurrent = st.sidebar.checkbox("Run independent tasks concurrently", value=True)
+    # A local Ollama only overlaps generations up to OLLAMA_NUM_PARALLEL
+    max_parallel = st.sidebar.number_input("Max concurrent LLM calls", min_value=1, max_value=8, value=2)
+    stream_output = st.sidebar.checkbox("Stream output as it arrives", value=True)
+    trace_run = st.sidebar.checkbox("Record timing trace", value=True)
     if st.sidebar.button("Run SAFe Simulation"):
         with st.spinner(f"Running simulation with {selected_model}..."):
             try:
@@ -151,14 +218,29 @@ def main():
                 # Pre-execution assertions
                 assert_safe_setup(agents, tasks)
                 
-                safe_crew = Crew(
-                    agents=list(agents.values()),
-                    tasks=tasks,
-                    process=Process.sequential,
-                    verbose=True
-                )
+                # Spans for every task, agent run, tool call and LLM request
+                tracer = CrewTracer(tasks) if trace_run else None
+                
+                if concurrent:
+                    run = lambda: cached_run_task_dag(tasks, bypass=bypass_cache, default_limit=max_parallel,
+                                                      tracer=tracer)
+                else:
+                    from crewai import Crew, Process
+
+                    safe_crew = Crew(
+                        agents=list(agents.values()),
+                        tasks=tasks,
+                        process=Process.sequential,
+                        verbose=True
+                    )
+                    run = lambda: cached_kickoff(safe_crew, bypass=bypass_cache)
                 
-                results = safe_crew.kickoff()
+                with tracer or nullcontext():
+                    if stream_output:
+                        enable_streaming(agents.values())
+                        results = stream_to(live_output, run, tasks)
+                    else:
+                        results = run()
                 
                 # Post-execution validation
                 # assert isinstance(results, dict), "Results should be a dictionary"
@@ -167,16 +249,42 @@ def main():
                 
                 st.session_state.results = results
                 st.session_state.execution_time = time.time() - start_time
+                st.session_state.trace_run_id = tracer.run_id if tracer else None
                 
             except AssertionError as ae:
                 st.error(f"Validation failed: {str(ae)}")
             except Exception as e:
                 st.error(f"Simulation failed: {str(e)}")
 
+    # Batched team ceremonies: many teams per prompt instead of one call per team
+    st.sidebar.header("Team Ceremonies")
+    ceremony = st.sidebar.selectbox("Ceremony", list(CEREMONY_FIELDS))
+    num_teams = st.sidebar.number_input("Teams", min_value=1, max_value=500, value=20)
+    batch_size = st.sidebar.number_input("Teams per prompt", min_value=1, max_value=50, value=10)
+    if st.sidebar.button("Run Team Ceremonies"):
+        with st.spinner(f"Running {ceremony} for {num_teams} teams..."):
+            try:
+                teams, progress = create_ceremony_teams(int(num_teams))
+                outputs, missing = run_batched_ceremony(
+                    ceremony, teams, create_ceremony_agent(selected_model), progress=progress,
+                    batch_size=int(batch_size), bypass=bypass_cache, default_limit=max_parallel
+                )
+                st.session_state.ceremony = (ceremony, outputs, missing)
+            except Exception as e:
+                st.error(f"Ceremony failed: {str(e)}")
+
+    if "ceremony" in st.session_state:
+        ceremony, outputs, missing = st.session_state.ceremony
+        st.header(f"Team {ceremony.title()} Outcomes")
+        st.dataframe(pd.DataFrame.from_dict(outputs, orient="index"))
+        if missing:
+            st.warning(f"No outcome for: {', '.join(missing)}")
+
     # Display results
     if "results" in st.session_state:
         st.header("Simulation Results")
-        st.caption(f"Executed in {st.session_state.execution_time:.2f} seconds")
+        source = "cache" if st.session_state.results.get("cached") else "LLM"
+        st.caption(f"Executed in {st.session_state.execution_time:.2f} seconds (from {source})")
         
         col1, col2 = st.columns(2)
         
@@ -193,6 +301,24 @@ def main():
                     st.markdown(f"**{task['description']}**")
                     st.markdown(f"```\n{task['result']}\n```")
         
+        # Where the time went: one bar per span, grouped by task
+        spans = load_spans(st.session_state.trace_run_id) if st.session_state.get("trace_run_id") else None
+        if spans is not None and len(spans):
+            import altair as alt
+
+            st.subheader("Run Waterfall")
+            spans["lane"] = spans["task"].fillna("").str.slice(0, 40) + " / " + spans["kind"]
+            st.altair_chart(
+                alt.Chart(spans).mark_bar().encode(
+                    x=alt.X("offset", title="seconds"),
+                    x2="end_offset",
+                    y=alt.Y("lane", sort=None, title=None),
+                    color="kind",
+                    tooltip=["kind", "name", "task", "duration", "prompt_tokens", "completion_tokens", "attrs"],
+                )
+            )
+            st.dataframe(span_summary(spans))
+        
         # Raw output
         with st.expander("Debug Details"):
             st.json(st.session_state.results)
@@ -0,0 +1,83 @@
+import heapq
+from bisect import bisect_left, insort
+
+import numpy as np
+
+UNASSIGNED = -1
+STRATEGIES = ("first_fit", "best_fit", "worst_fit")
+
+
+def _first_fit(efforts, capacity, assignment):
+    # Max segment tree over teams: descend to the leftmost team that fits
+    size = 1
+    while size < len(capacity):
+        size *= 2
+    tree = np.full(2 * size, -np.inf)
+    tree[size:size + len(capacity)] = capacity
+    for node in range(size - 1, 0, -1):
+        tree[node] = max(tree[2 * node], tree[2 * node + 1])
+    tree = tree.tolist()
+
+    for i, effort in enumerate(efforts):
+        if tree[1] < effort:
+            continue
+        node = 1
+        while node < size:
+            node = 2 * node if tree[2 * node] >= effort else 2 * node + 1
+        team = node - size
+        assignment[i] = team
+        tree[node] -= effort
+        node //= 2
+        while node:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+        capacity[team] = tree[size + team]
+
+
+def _worst_fit(efforts, capacity, assignment):
+    # Max-heap on remaining capacity spreads load across the train
+    heap = [(-c, team) for team, c in enumerate(capacity)]
+    heapq.heapify(heap)
+    for i, effort in enumerate(efforts):
+        if not heap or -heap[0][0] < effort:
+            continue
+        remaining, team = heap[0]
+        remaining = -remaining - effort
+        heapq.heapreplace(heap, (-remaining, team))
+        assignment[i] = team
+        capacity[team] = remaining
+
+
+def _best_fit(efforts, capacity, assignment):
+    # Sorted (capacity, team) index: bisect finds the tightest team that fits in O(log T),
+    # re-inserting it shifts the list, which is O(T) but a memmove
+    index = sorted((c, team) for team, c in enumerate(capacity))
+    for i, effort in enumerate(efforts):
+        pos = bisect_left(index, (effort, -1))
+        if pos == len(index):
+            continue
+        remaining, team = index.pop(pos)
+        remaining -= effort
+        insort(index, (remaining, team))
+        assignment[i] = team
+        capacity[team] = remaining
+
+
+def assign_features(efforts, capacities, strategy="first_fit"):
+    """Assign a batch of features to teams in the order given.
+
+    Returns the team index per feature (UNASSIGNED when nothing fits) and the
+    remaining capacity per team. For T teams each feature costs O(log T)
+    with first_fit and worst_fit, and O(T) in the worst case with best_fit.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown assignment strategy {strategy!r}, expected one of {STRATEGIES}")
+
+    capacities = np.asarray(capacities)
+    efforts = np.asarray(efforts).tolist()
+    capacity = capacities.tolist()
+    assignment = [UNASSIGNED] * len(efforts)
+    if capacity:
+        {"first_fit": _first_fit, "best_fit": _best_fit, "worst_fit": _worst_fit}[strategy](
+            efforts, capacity, assignment)
+    return np.asarray(assignment, dtype=np.int32), np.asarray(capacity, dtype=capacities.dtype)
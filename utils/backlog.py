@@ -0,0 +1,226 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from utils.generate_data import ITEM_TYPES
+
+STATUSES = ["Not Started", "In Progress", "Completed"]
+NO_TEAM = -1
+NO_DEPENDENCY = -1
+
+
+class Backlog:
+    """Array-backed backlog shared by the planning, sprint and I&A workflows.
+
+    Every column is a NumPy array of the same length. Categorical columns
+    (type, status, assigned_team) are stored as small integer codes; the
+    labels live in ITEM_TYPES, STATUSES and `self.teams`.
+    """
+
+    COLUMNS = ("id", "type", "priority", "estimated_effort", "assigned_team", "status", "depends_on")
+
+    def __init__(self, id, type, priority, estimated_effort,
+                 assigned_team=None, status=None, depends_on=None, teams=None):
+        # Columns are copied so the backlog owns writable arrays
+        n = len(id)
+        self.id = np.array(id, dtype=np.int64)
+        self.type = np.array(type, dtype=np.int8)
+        self.priority = np.array(priority, dtype=np.int8)
+        self.estimated_effort = np.array(estimated_effort, dtype=np.int32)
+        self.assigned_team = (np.full(n, NO_TEAM, dtype=np.int32) if assigned_team is None
+                              else np.array(assigned_team, dtype=np.int32))
+        self.status = (np.zeros(n, dtype=np.int8) if status is None
+                       else np.array(status, dtype=np.int8))
+        self.depends_on = (np.full(n, NO_DEPENDENCY, dtype=np.int64) if depends_on is None
+                           else np.array(depends_on, dtype=np.int64))
+        self.teams = list(teams or [])
+        self._team_codes = {name: code for code, name in enumerate(self.teams)}
+
+    # Construction / export ---------------------------------------------------
+    @classmethod
+    def from_frame(cls, df, teams=None):
+        backlog = cls(
+            id=df["id"].to_numpy(),
+            type=pd.Categorical(df["type"], categories=ITEM_TYPES).codes,
+            priority=df["priority"].to_numpy(),
+            estimated_effort=df["estimated_effort"].to_numpy(),
+            teams=teams,
+        )
+        if "status" in df:
+            backlog.status = np.array(pd.Categorical(df["status"].fillna(STATUSES[0]), categories=STATUSES).codes,
+                                      dtype=np.int8)
+        if "depends_on" in df:
+            backlog.depends_on = np.array(df["depends_on"].fillna(NO_DEPENDENCY), dtype=np.int64)
+        if "assigned_team" in df:
+            backlog.assigned_team = backlog.team_codes(df["assigned_team"])
+        return backlog
+
+    @classmethod
+    def from_records(cls, records, teams=None):
+        return cls.from_frame(pd.DataFrame.from_records(records), teams=teams)
+
+    def to_frame(self):
+        team_labels = np.asarray(self.teams + [None], dtype=object)
+        return pd.DataFrame({
+            "id": self.id,
+            "type": pd.Categorical.from_codes(self.type, categories=ITEM_TYPES),
+            "priority": self.priority,
+            "estimated_effort": self.estimated_effort,
+            "assigned_team": team_labels[self.assigned_team],
+            "status": pd.Categorical.from_codes(self.status, categories=STATUSES),
+            "depends_on": pd.array(np.where(self.depends_on == NO_DEPENDENCY, None, self.depends_on),
+                                   dtype="Int64"),
+        })
+
+    def __len__(self):
+        return len(self.id)
+
+    def copy(self):
+        return self.take(slice(None))
+
+    def fingerprint(self):
+        """Content hash of every column and the team labels, e.g. for cache keys."""
+        digest = hashlib.sha256()
+        for column in self.COLUMNS:
+            digest.update(np.ascontiguousarray(self[column]).tobytes())
+        digest.update("\x1f".join(self.teams).encode())
+        return digest.hexdigest()
+
+    def __getitem__(self, column):
+        return getattr(self, column)
+
+    # Labels <-> codes --------------------------------------------------------
+    def team_code(self, name):
+        # Register unseen team names so assignments never need a rebuild
+        if name is None:
+            return NO_TEAM
+        code = self._team_codes.get(name)
+        if code is None:
+            code = self._team_codes[name] = len(self.teams)
+            self.teams.append(name)
+        return code
+
+    def team_codes(self, names):
+        inverse, uniques = pd.factorize(pd.Series(names), use_na_sentinel=True)
+        lookup = np.asarray([self.team_code(name) for name in uniques] + [NO_TEAM], dtype=np.int32)
+        return lookup[inverse]
+
+    def _code(self, column, value):
+        if column == "type" and isinstance(value, str):
+            return ITEM_TYPES.index(value)
+        if column == "status" and isinstance(value, str):
+            return STATUSES.index(value)
+        if column == "assigned_team" and (value is None or isinstance(value, str)):
+            return self.team_code(value)
+        return value
+
+    # Vectorized operations ---------------------------------------------------
+    def mask(self, **conditions):
+        """Boolean mask of rows where every column equals the given label."""
+        selected = np.ones(len(self), dtype=bool)
+        for column, value in conditions.items():
+            selected &= self[column] == self._code(column, value)
+        return selected
+
+    def where(self, **conditions):
+        return np.flatnonzero(self.mask(**conditions))
+
+    def take(self, rows):
+        return Backlog(
+            **{column: self[column][rows] for column in self.COLUMNS},
+            teams=self.teams,
+        )
+
+    def update(self, rows, **values):
+        # `rows` is a boolean mask or an index array; values are labels or arrays
+        for column, value in values.items():
+            self[column][rows] = self._code(column, value)
+
+    def group_sum(self, values, by="assigned_team", rows=None, minlength=None):
+        """Sum `values` (a column name or array) per code of the `by` column."""
+        keys = self[by]
+        weights = self[values] if isinstance(values, str) else np.asarray(values)
+        if rows is not None:
+            keys, weights = keys[rows], weights[rows]
+        valid = keys >= 0
+        if minlength is None:
+            minlength = len(self.teams) if by == "assigned_team" else 0
+        return np.bincount(keys[valid], weights=weights[valid], minlength=minlength)
+
+    def group_count(self, by="assigned_team", rows=None, minlength=None):
+        return self.group_sum(np.ones(len(self), dtype=np.int64), by=by, rows=rows,
+                              minlength=minlength).astype(np.int64)
+
+    def index_of(self, ids):
+        """Row of each id, or -1 for ids not in this backlog."""
+        ids = np.asarray(ids, dtype=np.int64)
+        # Generated ids are 0..n-1 in row order, which makes the lookup a range check
+        if np.array_equal(self.id, np.arange(len(self))):
+            return np.where((ids >= 0) & (ids < len(self)), ids, -1)
+        if not len(self):
+            return np.full(ids.shape, -1, dtype=np.int64)
+        order = np.argsort(self.id, kind="stable")
+        rows = order[np.minimum(np.searchsorted(self.id, ids, sorter=order), len(self) - 1)]
+        return np.where(self.id[rows] == ids, rows, -1)
+
+    def burn_down(self, rows, work):
+        """Spend `work` effort on `rows` in order and return the rows completed."""
+        rows = np.asarray(rows, dtype=np.int64)
+        rows = rows[self.status[rows] != STATUSES.index("Completed")]
+        effort = self.estimated_effort[rows]
+        done = np.cumsum(effort) <= work
+        completed = rows[done]
+        self.status[completed] = STATUSES.index("Completed")
+
+        # The first unfinished item absorbs whatever work is left over
+        spent = int(effort[done].sum())
+        if len(completed) < len(rows) and work > spent:
+            partial = rows[len(completed)]
+            self.estimated_effort[partial] -= work - spent
+            self.status[partial] = STATUSES.index("In Progress")
+        return completed
+
+    def team_queues(self, num_teams=None, ready=None):
+        """Open items grouped by assigned_team, in backlog order within a team.
+
+        Returns (rows, teams, spent_before, spent_after) where the last two are
+        the running effort of each team's queue before and after the item.
+        """
+        num_teams = len(self.teams) if num_teams is None else num_teams
+        open_mask = ((self.assigned_team >= 0) & (self.assigned_team < num_teams)
+                     & (self.status != STATUSES.index("Completed")))
+        if ready is not None:
+            open_mask &= ready
+        open_rows = np.flatnonzero(open_mask)
+        rows = open_rows[np.argsort(self.assigned_team[open_rows], kind="stable")]
+        teams = self.assigned_team[rows]
+        effort = self.estimated_effort[rows].astype(np.int64)
+
+        # Restart the cumulative sum at each team boundary
+        spent_after = np.cumsum(effort)
+        if len(rows):
+            starts = np.flatnonzero(np.r_[True, teams[1:] != teams[:-1]])
+            offsets = (spent_after - effort)[starts]
+            spent_after -= np.repeat(offsets, np.diff(np.r_[starts, len(rows)]))
+        return rows, teams, spent_after - effort, spent_after
+
+    def burn_down_by_team(self, work, ready=None):
+        """Burn down every team at once; `work[code]` is that team's effort for the sprint.
+
+        Each team spends its work on its queue in backlog order, same as
+        `burn_down`, skipping rows outside the `ready` mask when one is given.
+        Returns the rows completed.
+        """
+        work = np.asarray(work)
+        rows, teams, spent_before, spent_after = self.team_queues(len(work), ready)
+        budget = work[teams]
+
+        done = spent_after <= budget
+        self.status[rows[done]] = STATUSES.index("Completed")
+
+        # At most one item per team is left partially done
+        partial = ~done & (spent_before < budget)
+        self.estimated_effort[rows[partial]] -= (budget - spent_before)[partial].astype(np.int32)
+        self.status[rows[partial]] = STATUSES.index("In Progress")
+        return rows[done]
@@ -0,0 +1,155 @@
+import heapq
+import itertools
+
+DEFAULT_SEVERITY = 1
+
+# Keyword rules for blockers reported without a category
+CATEGORIES = {
+    "environment": ("environment", "env ", "server", "infrastructure", "pipeline", "build"),
+    "dependency": ("dependency", "depends", "waiting on", "blocked by", "another team"),
+    "review": ("review", "approval", "sign-off", "signoff"),
+    "capacity": ("sick", "leave", "vacation", "capacity", "staff"),
+}
+OTHER = "other"
+
+
+def categorize(text):
+    lowered = f"{text.lower()} "
+    for category, keywords in CATEGORIES.items():
+        if any(keyword in lowered for keyword in keywords):
+            return category
+    return OTHER
+
+
+class Blocker:
+    __slots__ = ("team", "text", "category", "severity", "first_seen", "last_seen", "occurrences",
+                 "escalated_on", "resolved", "version")
+
+    def __init__(self, team, text, category, severity, day):
+        self.team = team
+        self.text = text
+        self.category = category
+        self.severity = severity
+        self.first_seen = day
+        self.last_seen = day
+        self.occurrences = 1
+        self.escalated_on = None
+        self.resolved = False
+        self.version = 0
+
+    @property
+    def key(self):
+        return self.team, self.text
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != "version"}
+
+
+class BlockerBoard:
+    """Open standup blockers, deduplicated across days and ordered for escalation.
+
+    `ingest` takes one day of `ScrumMaster.run_standup` blockers; a blocker a
+    team reports again is the same blocker and only its bookkeeping changes.
+    The RTE `drain`s the most severe, then oldest, open blockers in bounded
+    batches. A drained blocker is escalated, not cleared: it stays open until
+    its team stops reporting it, but is not escalated again unless its
+    severity or category changes. Cleared blockers are dropped from the
+    board. The heap is invalidated lazily, so a day costs
+    O(reports + changes * log n) rather than a pass over every open blocker.
+    """
+
+    def __init__(self):
+        self.blockers = {}
+        self.by_team = {}
+        self.by_category = {}
+        self._heap = []
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self.blockers)
+
+    def _push(self, blocker):
+        # The sequence number doubles as the version, so it stays unique when a cleared key is reported again
+        blocker.version = next(self._seq)
+        heapq.heappush(self._heap, (-blocker.severity, blocker.first_seen, blocker.version, blocker.key))
+
+    def _index(self, blocker):
+        self.by_team.setdefault(blocker.team, set()).add(blocker.key)
+        self.by_category.setdefault(blocker.category, set()).add(blocker.key)
+
+    def _unindex(self, blocker):
+        self.by_team.get(blocker.team, set()).discard(blocker.key)
+        self.by_category.get(blocker.category, set()).discard(blocker.key)
+
+    def ingest(self, blockers, day, reported_teams=None):
+        """Fold one day of blockers in; returns the blockers that are new, reopened or changed.
+
+        Blockers of `reported_teams` that were not reported again on `day`
+        are treated as cleared by their team; reporting one again later
+        reopens it as a new blocker.
+        """
+        changed = []
+        seen = set()
+        for item in blockers:
+            text = item['blocker']
+            key = (item['team'], text)
+            seen.add(key)
+            category = item.get('category') or categorize(text)
+            severity = item.get('severity', DEFAULT_SEVERITY)
+            blocker = self.blockers.get(key)
+            if blocker is None:
+                blocker = self.blockers[key] = Blocker(item['team'], text, category, severity, day)
+            elif blocker.last_seen == day:
+                continue
+            else:
+                blocker.last_seen = day
+                blocker.occurrences += 1
+                if (blocker.severity, blocker.category) == (severity, category):
+                    # A recurring blocker, escalated or still queued: nothing to reprocess
+                    continue
+                self._unindex(blocker)
+                blocker.severity, blocker.category = severity, category
+                # A change keeps its age but needs escalating again
+                blocker.escalated_on = None
+            self._index(blocker)
+            self._push(blocker)
+            changed.append(blocker)
+
+        for team in reported_teams or ():
+            for key in list(self.by_team.get(team, ())):
+                if key not in seen:
+                    self.resolve(self.blockers[key])
+        return changed
+
+    def resolve(self, blocker):
+        # Stale heap entries are skipped when they surface
+        blocker.resolved = True
+        self._unindex(blocker)
+        del self.blockers[blocker.key]
+
+    def drain(self, limit=None, day=None):
+        """Escalate up to `limit` queued blockers, most severe and then oldest first.
+
+        Escalated blockers leave the queue but stay open (see `ingest`);
+        `escalated_on` records `day`, by default the day they were last seen.
+        """
+        drained = []
+        while self._heap and (limit is None or len(drained) < limit):
+            _, _, version, key = heapq.heappop(self._heap)
+            blocker = self.blockers.get(key)
+            if blocker is None or blocker.escalated_on is not None or blocker.version != version:
+                continue
+            blocker.escalated_on = blocker.last_seen if day is None else day
+            drained.append(blocker)
+        return drained
+
+    def open_blockers(self, team=None, category=None):
+        keys = None
+        if team is not None:
+            keys = set(self.by_team.get(team, ()))
+        if category is not None:
+            in_category = self.by_category.get(category, set())
+            keys = in_category.copy() if keys is None else keys & in_category
+        if keys is None:
+            return list(self.blockers.values())
+        return [self.blockers[key] for key in keys]
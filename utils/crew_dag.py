@@ -0,0 +1,103 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import threading
+import time
+
+from utils.llm_cache import ResponseCache, _digest, cache_enabled, task_keys
+
+# Concurrent LLM requests per backend unless overridden in backend_limits
+DEFAULT_BACKEND_LIMIT = 4
+
+
+def upstream_tasks(task):
+    # Upstream tasks are declared through crewai's own Task.context
+    context = getattr(task, "context", None)
+    return list(context) if isinstance(context, (list, tuple)) else []
+
+
+def backend_of(task):
+    """Key that groups tasks sharing one LLM server (base_url, else model)."""
+    llm = getattr(task.agent, "llm", None)
+    return getattr(llm, "base_url", None) or getattr(llm, "model", None) or str(llm)
+
+
+def run_task_dag(tasks, max_workers=None, backend_limits=None, default_limit=DEFAULT_BACKEND_LIMIT, tracer=None):
+    """Execute crew tasks as a DAG, running independent tasks concurrently.
+
+    Each task waits only for the tasks in its `context` and receives their
+    outputs as context. `backend_limits` caps in-flight tasks per LLM backend
+    (see `backend_of`), e.g. {"http://localhost:11434": 2}; tasks sharing an
+    agent run one after another. Tasks must be listed after their upstream
+    tasks. A `utils.tracing.CrewTracer` gets a "queue" span per task for the
+    time it was ready but waiting for a worker, its agent or its backend.
+    Returns the same dict shape as `utils.llm_cache.cached_kickoff`, with
+    tasks in declaration order.
+    """
+    backend_limits = backend_limits or {}
+    position = {id(task): i for i, task in enumerate(tasks)}
+    for task in tasks:
+        for upstream in upstream_tasks(task):
+            if position.get(id(upstream), len(tasks)) >= position[id(task)]:
+                raise ValueError(f"Task {task.description!r} must come after the tasks in its context")
+
+    semaphores = {}
+    for task in tasks:
+        backend = backend_of(task)
+        if backend not in semaphores:
+            semaphores[backend] = threading.Semaphore(backend_limits.get(backend, default_limit))
+    # A crewai agent can only execute one task at a time
+    agent_locks = {id(task.agent): threading.Lock() for task in tasks}
+
+    outputs = {}
+    children = {id(task): [] for task in tasks}
+    waiting = {}
+    for task in tasks:
+        upstream = upstream_tasks(task)
+        waiting[id(task)] = len(upstream)
+        for parent in upstream:
+            children[id(parent)].append(task)
+
+    def execute(task, ready):
+        context = "\n\n".join(outputs[id(t)].raw for t in upstream_tasks(task)) or None
+        with agent_locks[id(task.agent)], semaphores[backend_of(task)]:
+            if tracer is not None:
+                tracer.record("queue", backend_of(task), ready, time.time(), task=task.description)
+            return task.execute_sync(agent=task.agent, context=context, tools=task.tools)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks) or 1) as pool:
+        running = {pool.submit(execute, task, time.time()): task for task in tasks if waiting[id(task)] == 0}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                outputs[id(task)] = future.result()
+                for child in children[id(task)]:
+                    waiting[id(child)] -= 1
+                    if waiting[id(child)] == 0:
+                        running[pool.submit(execute, child, time.time())] = child
+
+    ordered = [outputs[id(task)] for task in tasks]
+    return {
+        "raw": ordered[-1].raw if ordered else "",
+        "tasks": [
+            {"description": task.description, "agent": output.agent, "result": output.raw}
+            for task, output in zip(tasks, ordered)
+        ],
+    }
+
+
+def cached_run_task_dag(tasks, cache=None, bypass=False, **kwargs):
+    """`run_task_dag` behind the same content-addressed cache as `cached_kickoff`."""
+    if not cache_enabled():
+        return {**run_task_dag(tasks, **kwargs), "cached": False}
+
+    if cache is None:
+        cache = ResponseCache()
+    key = _digest({"process": "dag", "tasks": task_keys(tasks, sequential=False)})
+    if not bypass:
+        hit = cache.get(key)
+        if hit is not None:
+            return {**hit, "cached": True}
+
+    result = run_task_dag(tasks, **kwargs)
+    cache.put(key, result)
+    return {**result, "cached": False}
@@ -0,0 +1,81 @@
+import queue
+import threading
+
+# Event kinds yielded by `stream_run`
+TOKEN, TASK, DONE, ERROR = "token", "task", "done", "error"
+
+
+def enable_streaming(agents):
+    # Ask each agent's LLM for token chunks; results and cache keys are unchanged
+    for agent in agents:
+        if getattr(agent, "llm", None) is not None and hasattr(agent.llm, "stream"):
+            agent.llm.stream = True
+
+
+def stream_run(run, tasks):
+    """Run `run()` on a background thread and yield its progress as it happens.
+
+    Yields (TOKEN, (task description, chunk)) for streamed LLM tokens,
+    (TASK, {"description", "agent", "result"}) as each task completes, then
+    (DONE, run()'s return value) or (ERROR, exception). Token and task events
+    are only produced when `run()` actually calls the LLMs of `tasks`, so a
+    cache hit yields DONE straight away.
+    """
+    from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+
+    events = queue.Queue()
+    descriptions = {str(task.id): task.description for task in tasks}
+
+    def on_chunk(source, event):
+        # The event bus is process-wide; keep only chunks from our own tasks
+        if event.task_id in descriptions and event.chunk:
+            events.put((TOKEN, (descriptions[event.task_id], event.chunk)))
+
+    def on_task_done(task, callback):
+        def notify(output):
+            events.put((TASK, {"description": task.description, "agent": output.agent, "result": output.raw}))
+            return callback(output) if callback else None
+        return notify
+
+    callbacks = {id(task): task.callback for task in tasks}
+    for task in tasks:
+        task.callback = on_task_done(task, task.callback)
+    crewai_event_bus.on(LLMStreamChunkEvent)(on_chunk)
+
+    def target():
+        try:
+            events.put((DONE, run()))
+        except Exception as exc:
+            events.put((ERROR, exc))
+
+    threading.Thread(target=target, name="crew-stream", daemon=True).start()
+    try:
+        while True:
+            kind, payload = events.get()
+            yield kind, payload
+            if kind in (DONE, ERROR):
+                break
+    finally:
+        crewai_event_bus.off(LLMStreamChunkEvent, on_chunk)
+        for task in tasks:
+            task.callback = callbacks[id(task)]
+
+
+def stream_to(container, run, tasks):
+    """Drain `stream_run` into one live placeholder per task inside a Streamlit container.
+
+    Returns what `run()` returned and re-raises its exception.
+    """
+    placeholders = {task.description: container.empty() for task in tasks}
+    text = {task.description: "" for task in tasks}
+    for kind, payload in stream_run(run, tasks):
+        if kind == TOKEN:
+            description, chunk = payload
+            text[description] += chunk
+            placeholders[description].markdown(f"**{description}** ⏳\n\n{text[description]}")
+        elif kind == TASK:
+            placeholders[payload["description"]].markdown(f"**{payload['description']}** ✅\n\n{payload['result']}")
+        elif kind == DONE:
+            return payload
+        else:
+            raise payload
@@ -1,9 +1,161 @@
+import os
 import sqlite3
+import threading
+import time
+
 import pandas as pd
 
-def get_metrics():
-    conn = sqlite3.connect("data/metrics.db")
-    query = "SELECT * FROM metrics"
-    metrics = pd.read_sql_query(query, conn)
-    conn.close()
-    return metrics
\ No newline at end of file
+DB_PATH = "data/metrics.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL,
+    pi INTEGER NOT NULL,
+    sprint INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_run ON metrics (run_id, pi, sprint);
+CREATE INDEX IF NOT EXISTS idx_metrics_team ON metrics (team, metric, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_metrics_time ON metrics (recorded_at);
+"""
+
+# Fields of a sprint_progress row that are stored as metrics
+PROGRESS_METRICS = ("progress", "remaining", "completed", "points", "planned")
+AGGREGATES = ("avg", "sum", "min", "max", "count")
+
+# One connection per (thread, database); sqlite3 connections are not shared across threads
+_local = threading.local()
+
+
+def get_connection(path=DB_PATH, schema=SCHEMA):
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(schema)
+        connections[path] = conn
+    return conn
+
+
+def close_connections():
+    for conn in getattr(_local, "connections", {}).values():
+        conn.close()
+    _local.connections = {}
+
+
+def _reset_after_fork():
+    # A connection must not be used on both sides of a fork
+    global _local
+    _local = threading.local()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def write_metrics(rows, path=DB_PATH):
+    """Insert (run_id, pi, sprint, team, metric, value[, recorded_at]) rows in one transaction."""
+    now = time.time()
+    rows = [row if len(row) == 7 else (*row, now) for row in rows]
+    conn = get_connection(path)
+    with conn:
+        conn.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def record_sprint_progress(progress, run_id, pi, sprint, path=DB_PATH):
+    # Flatten execute_sprint's progress rows into one metric row per field
+    rows = [
+        (run_id, pi, sprint, item['team'], metric, float(item[metric]))
+        for item in progress
+        for metric in PROGRESS_METRICS
+        if metric in item
+    ]
+    return write_metrics(rows, path)
+
+
+class MetricsStore:
+    """Per-team metrics of one run, written in batches.
+
+    Workflows given a store `record` into it; rows are buffered and inserted
+    with one executemany per `batch_size` rows and on `flush`, so a run of
+    many sprints or scenarios does not pay a transaction per metric.
+    """
+
+    def __init__(self, run_id, path=DB_PATH, batch_size=10_000):
+        self.run_id = run_id
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+        self._rows = []
+
+    def record(self, pi, sprint, team, metrics):
+        """Buffer one row per entry of the `metrics` dict."""
+        now = time.time()
+        self._rows.extend((self.run_id, pi, sprint, team, metric, float(value), now)
+                          for metric, value in metrics.items())
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def record_progress(self, progress, pi, sprint):
+        # Same fields as record_sprint_progress
+        for item in progress:
+            self.record(pi, sprint, item['team'], {metric: item[metric] for metric in PROGRESS_METRICS
+                                                   if metric in item})
+
+    def flush(self):
+        if self._rows:
+            rows, self._rows = self._rows, []
+            self.written += write_metrics(rows, self.path)
+        return self.written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        return False
+
+
+def _where(run_id=None, pi=None, sprint=None, team=None, metric=None, since=None, until=None):
+    clauses, params = [], []
+    for column, value in (("run_id", run_id), ("pi", pi), ("sprint", sprint), ("team", team), ("metric", metric)):
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if since is not None:
+        clauses.append("recorded_at >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("recorded_at < ?")
+        params.append(until)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def get_metrics(path=DB_PATH, **filters):
+    """Metric rows matching the filters (run_id, pi, sprint, team, metric, since, until)."""
+    where, params = _where(**filters)
+    return pd.read_sql_query(f"SELECT * FROM metrics{where}", get_connection(path), params=params)
+
+
+def aggregate_metrics(by=("team",), agg="avg", path=DB_PATH, **filters):
+    """Aggregate `value` per metric and the `by` keys inside SQLite."""
+    if agg not in AGGREGATES:
+        raise ValueError(f"Unknown aggregate {agg!r}, expected one of {AGGREGATES}")
+    keys = [key for key in by if key in ("run_id", "pi", "sprint", "team")] + ["metric"]
+    columns = ", ".join(keys)
+    where, params = _where(**filters)
+    query = f"SELECT {columns}, {agg.upper()}(value) AS value FROM metrics{where} GROUP BY {columns}"
+    return pd.read_sql_query(query, get_connection(path), params=params)
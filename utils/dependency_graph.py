@@ -0,0 +1,282 @@
+import numpy as np
+
+from utils.backlog import NO_DEPENDENCY
+
+# Frontiers at least this wide are expanded with array operations
+_WIDE_LEVEL = 64
+
+
+def _csr(keys, values, n):
+    # Compressed adjacency: neighbours of node v are values[indptr[v]:indptr[v + 1]]
+    order = np.argsort(keys, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n), out=indptr[1:])
+    return indptr, np.asarray(values, dtype=np.int64)[order]
+
+
+def _gather(indptr, indices, nodes):
+    # Concatenate the neighbour slices of every node in `nodes` without a Python loop
+    starts, ends = indptr[nodes], indptr[nodes + 1]
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), lengths
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return indices[offsets + np.arange(total)], lengths
+
+
+class DependencyGraph:
+    """Dependency index over backlog rows.
+
+    An edge u -> v means row v depends on row u, so u has to finish first.
+    Edges are kept as CSR arrays in both directions; incremental inserts and
+    deletes go to a small overlay that is folded back in on whole-graph
+    queries or once it grows past `compact_ratio` of the edge count.
+    """
+
+    def __init__(self, n, sources=(), targets=(), compact_ratio=0.1):
+        self.n = n
+        self.compact_ratio = compact_ratio
+        self._build(np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64))
+
+    @classmethod
+    def from_backlog(cls, backlog, **kwargs):
+        rows = np.flatnonzero(backlog.depends_on != NO_DEPENDENCY)
+        upstream = backlog.index_of(backlog.depends_on[rows])
+
+        # Drop dependencies on ids that are not in this backlog
+        known = upstream >= 0
+        return cls(len(backlog), upstream[known], rows[known], **kwargs)
+
+    def _build(self, sources, targets):
+        pairs = np.unique(np.stack([sources, targets], axis=1), axis=0) if len(sources) else \
+            np.empty((0, 2), dtype=np.int64)
+        sources, targets = pairs[:, 0], pairs[:, 1]
+        self._out_ptr, self._out = _csr(sources, targets, self.n)
+        self._in_ptr, self._in = _csr(targets, sources, self.n)
+        self._added_out, self._added_in, self._removed = {}, {}, set()
+
+    def _pending(self):
+        return len(self._removed) + sum(len(v) for v in self._added_out.values())
+
+    def compact(self):
+        """Fold pending inserts and deletes back into the CSR arrays."""
+        if not self._pending():
+            return
+        sources, targets = self.edges()
+        self._build(sources, targets)
+
+    # Queries -----------------------------------------------------------------
+    def edges(self):
+        sources = np.repeat(np.arange(self.n, dtype=np.int64), np.diff(self._out_ptr))
+        targets = self._out
+        if self._removed:
+            removed = np.asarray(sorted(self._removed), dtype=np.int64).reshape(-1, 2)
+            keep = ~np.isin(sources * self.n + targets, removed[:, 0] * self.n + removed[:, 1])
+            sources, targets = sources[keep], targets[keep]
+        extra = [(u, v) for u, vs in self._added_out.items() for v in vs]
+        if extra:
+            extra = np.asarray(extra, dtype=np.int64)
+            sources = np.concatenate([sources, extra[:, 0]])
+            targets = np.concatenate([targets, extra[:, 1]])
+        return sources, targets
+
+    @property
+    def num_edges(self):
+        return len(self._out) - len(self._removed) + sum(len(v) for v in self._added_out.values())
+
+    def successors(self, node):
+        """Rows that directly depend on `node`."""
+        base = self._out[self._out_ptr[node]:self._out_ptr[node + 1]].tolist()
+        if self._removed:
+            base = [v for v in base if (node, v) not in self._removed]
+        return base + self._added_out.get(node, [])
+
+    def predecessors(self, node):
+        """Rows that `node` directly depends on."""
+        base = self._in[self._in_ptr[node]:self._in_ptr[node + 1]].tolist()
+        if self._removed:
+            base = [u for u in base if (u, node) not in self._removed]
+        return base + self._added_in.get(node, [])
+
+    def out_edges(self, nodes):
+        """All (parents, children) edge arrays leaving `nodes`, gathered in one pass."""
+        self.compact()
+        nodes = np.asarray(nodes, dtype=np.int64)
+        children, lengths = _gather(self._out_ptr, self._out, nodes)
+        return np.repeat(nodes, lengths), children
+
+    def has_edge(self, u, v):
+        if (u, v) in self._removed:
+            return False
+        return v in self._added_out.get(u, ()) or \
+            bool(np.any(self._out[self._out_ptr[u]:self._out_ptr[u + 1]] == v))
+
+    # Incremental updates -----------------------------------------------------
+    def add_edge(self, u, v):
+        if self.has_edge(u, v):
+            return
+        if (u, v) in self._removed:
+            self._removed.discard((u, v))
+        else:
+            self._added_out.setdefault(u, []).append(v)
+            self._added_in.setdefault(v, []).append(u)
+        self._maybe_compact()
+
+    def remove_edge(self, u, v):
+        if not self.has_edge(u, v):
+            return
+        if v in self._added_out.get(u, ()):
+            self._added_out[u].remove(v)
+            self._added_in[v].remove(u)
+        else:
+            self._removed.add((u, v))
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self._pending() > max(1024, self.compact_ratio * len(self._out)):
+            self.compact()
+
+    # Whole-graph algorithms --------------------------------------------------
+    def levels(self):
+        """Kahn's algorithm one frontier at a time; returns the list of levels.
+
+        Rows on or downstream of a cycle never reach in-degree zero and are
+        left out, see `cycles()`.
+        """
+        self.compact()
+        indegree = np.diff(self._in_ptr)
+        frontier = np.flatnonzero(indegree == 0)
+        levels = []
+        out_ptr = out = None
+        while len(frontier):
+            levels.append(frontier)
+            if len(frontier) >= _WIDE_LEVEL:
+                indegree = np.asarray(indegree)
+                children, _ = _gather(self._out_ptr, self._out, frontier)
+                np.subtract.at(indegree, children, 1)
+                children = np.unique(children)
+                frontier = children[indegree[children] == 0]
+                continue
+
+            # Narrow levels (long chains) are cheaper without array overhead
+            if out is None:
+                out_ptr, out = self._out_ptr.tolist(), self._out.tolist()
+            if not isinstance(indegree, list):
+                indegree = indegree.tolist()
+            ready = []
+            for u in frontier.tolist():
+                for v in out[out_ptr[u]:out_ptr[u + 1]]:
+                    indegree[v] -= 1
+                    if indegree[v] == 0:
+                        ready.append(v)
+            frontier = np.asarray(ready, dtype=np.int64)
+        return levels
+
+    def topological_order(self):
+        levels = self.levels()
+        return np.concatenate(levels) if levels else np.empty(0, dtype=np.int64)
+
+    def cycles(self):
+        """Strongly connected components that form dependency cycles."""
+        self.compact()
+        remaining = np.ones(self.n, dtype=bool)
+        remaining[self.topological_order()] = False
+
+        # Iterative Tarjan over the rows Kahn's algorithm could not order
+        index, low = {}, {}
+        stack, on_stack, cycles = [], set(), []
+        counter = 0
+        for root in np.flatnonzero(remaining).tolist():
+            if root in index:
+                continue
+            work = [(root, iter(self.successors(root)))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if not remaining[child]:
+                        continue
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.successors(child))))
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or self.has_edge(node, node):
+                            cycles.append(component[::-1])
+        return cycles
+
+    def critical_path(self, weights):
+        """Longest weighted chain through the DAG, e.g. by `estimated_effort`.
+
+        Returns (length, rows on the path in dependency order).
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        finish = weights.copy()
+        start = np.zeros(self.n)
+        levels = self.levels()
+        if len(levels) * _WIDE_LEVEL > self.n:
+            # Deep graph: one pass over the topological order
+            start, finish_list, w = start.tolist(), finish.tolist(), weights.tolist()
+            out_ptr, out = self._out_ptr.tolist(), self._out.tolist()
+            for u in np.concatenate(levels).tolist():
+                finish_list[u] = f = start[u] + w[u]
+                for v in out[out_ptr[u]:out_ptr[u + 1]]:
+                    if f > start[v]:
+                        start[v] = f
+            finish = np.asarray(finish_list)
+        else:
+            for frontier in levels:
+                # Every upstream row of this level sits in an earlier level
+                finish[frontier] = start[frontier] + weights[frontier]
+                children, lengths = _gather(self._out_ptr, self._out, frontier)
+                np.maximum.at(start, children, np.repeat(finish[frontier], lengths))
+        if self.n == 0:
+            return 0.0, []
+
+        node = int(np.argmax(finish))
+        length = float(finish[node])
+        path = [node]
+        while True:
+            target = finish[node] - weights[node]
+            node = next((u for u in self.predecessors(node) if abs(finish[u] - target) <= 1e-9 * abs(target)),
+                        None)
+            if node is None:
+                break
+            path.append(node)
+        return length, path[::-1]
+
+    def blocked_by(self, node):
+        """Every row transitively waiting on `node`."""
+        seen = np.zeros(self.n, dtype=bool)
+        frontier = [node]
+        while frontier:
+            next_frontier = []
+            for u in frontier:
+                for v in self.successors(u):
+                    if not seen[v]:
+                        seen[v] = True
+                        next_frontier.append(v)
+            frontier = next_frontier
+        seen[node] = False
+        return np.flatnonzero(seen)
@@ -0,0 +1,255 @@
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from utils.database import get_connection
+
+EVENT_LOG_PATH = "data/events.jsonl"
+
+# SAFE_EVENT_LOG picks the file (a .db path writes to SQLite) or turns the log off;
+# SAFE_EVENT_LEVEL sets the minimum level
+EVENT_LOG_ENV = "SAFE_EVENT_LOG"
+EVENT_LEVEL_ENV = "SAFE_EVENT_LEVEL"
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+OFF = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL,
+    level TEXT NOT NULL,
+    event TEXT NOT NULL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_event ON events (event, ts);
+"""
+
+
+def _level(level):
+    return level if isinstance(level, int) else LEVELS[level.upper()]
+
+
+def _jsonable(value):
+    # numpy scalars and arrays
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+class EventLog:
+    """Structured simulation events written off the caller's thread.
+
+    `emit` records one event and `emit_batch` a whole column of them (one
+    event per row) in a single call, so a hot loop pays for a buffer append
+    rather than formatting and I/O, and a batch is written as one columnar
+    record. Events below `level` are dropped and
+    `sample` keeps one in every 1/rate events of a type, deterministically.
+    A daemon thread drains the buffer every `flush_interval` seconds or once
+    `buffer_size` events are pending; emitters wait when `max_pending` is
+    reached so a burst cannot grow the buffer without bound. `config` holds
+    the constructor arguments, so another process can open an equivalent log.
+    """
+
+    def __init__(self, path=EVENT_LOG_PATH, level="INFO", sample=None, buffer_size=1_000,
+                 flush_interval=1.0, max_pending=100_000):
+        self.config = {"path": path, "level": level, "sample": sample, "buffer_size": buffer_size,
+                       "flush_interval": flush_interval, "max_pending": max_pending}
+        self.path = path
+        self.level = OFF if path is None else _level(level)
+        self.sample = {event: max(1, round(1 / rate)) if rate > 0 else 0 for event, rate in (sample or {}).items()}
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.counts = {}
+        self.written = 0
+        self.dropped = 0
+        self._pending = []
+        self._size = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._writing = False
+        self._closed = False
+
+    def enabled(self, event, level="INFO"):
+        """Whether events of this type and level are recorded at all; lets callers skip building them."""
+        return _level(level) >= self.level and self.sample.get(event, 1) != 0
+
+    def _keep(self, event, n):
+        # Indices of the next n events of this type that survive sampling
+        step = self.sample.get(event, 1)
+        seen = self.counts.get(event, 0)
+        self.counts[event] = seen + n
+        if step == 1:
+            return slice(None)
+        return slice((-seen) % step, None, step)
+
+    def emit(self, event, level="INFO", **fields):
+        if not self.enabled(event, level):
+            return
+        with self._cond:
+            keep = self._keep(event, 1)
+            if keep.start:
+                return
+            self._append((time.time(), _level(level), event, fields, None), 1)
+
+    def emit_batch(self, event, level="INFO", **columns):
+        """One event per row of equally long `columns` (lists or numpy arrays)."""
+        if not self.enabled(event, level):
+            return
+        n = len(next(iter(columns.values()))) if columns else 0
+        if not n:
+            return
+        with self._cond:
+            keep = self._keep(event, n)
+            kept = len(range(n)[keep])
+            if not kept:
+                return
+            columns = {name: column[keep] if keep != slice(None) else column for name, column in columns.items()}
+            self._append((time.time(), _level(level), event, columns, kept), kept)
+
+    def _append(self, record, n):
+        # Called with the condition held
+        if self._closed:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        while self._size >= self.max_pending:
+            self._cond.notify_all()
+            self._cond.wait()
+        self._pending.append(record)
+        self._size += n
+        if self._size >= self.buffer_size:
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending and not self._closed:
+                    self._cond.wait(self.flush_interval)
+                records, self._pending, self._size = self._pending, [], 0
+                self._writing = bool(records)
+                closed = self._closed
+                self._cond.notify_all()
+            if records:
+                try:
+                    self._write(records)
+                except (OSError, sqlite3.Error) as e:
+                    # Losing events beats wedging every emitter behind a dead writer
+                    lost = sum(1 if n is None else n for *_, n in records)
+                    self.dropped += lost
+                    print(f"event log: dropped {lost} events: {e}", file=sys.stderr)
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+            if closed and not records:
+                return
+
+    def _write(self, records):
+        # A batch stays one record with a list per column; load_events expands it
+        names = {value: name for name, value in LEVELS.items()}
+        records = [(ts, names.get(level, str(level)), event,
+                    fields if n is None else {"_count": n, **fields}) for ts, level, event, fields, n in records]
+        if self.path.endswith(".db"):
+            rows = [(ts, level, event, json.dumps(fields, default=_jsonable)) for ts, level, event, fields in records]
+            conn = get_connection(self.path, SCHEMA)
+            with conn:
+                conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?)", rows)
+        else:
+            lines = [json.dumps({"ts": ts, "level": level, "event": event, **fields}, default=_jsonable)
+                     for ts, level, event, fields in records]
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # One append per flush keeps lines from concurrent processes whole
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        self.written += sum(fields.get("_count", 1) for *_, fields in records)
+
+    def flush(self):
+        """Block until everything emitted so far is written."""
+        with self._cond:
+            if self._thread is None:
+                return
+            self._cond.notify_all()
+            while (self._pending or self._writing) and self._thread.is_alive():
+                self._cond.wait(self.flush_interval)
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_event_log():
+    """The process-wide event log the workflows emit to, configured from the environment."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                path = os.getenv(EVENT_LOG_ENV, EVENT_LOG_PATH)
+                if path.lower() in ("0", "off", "false", "no"):
+                    path = None
+                _default = EventLog(path, level=os.getenv(EVENT_LEVEL_ENV, "INFO"))
+    return _default
+
+
+def _reset_after_fork():
+    # A forked worker inherits the parent's log but not its writer thread
+    global _default, _default_lock
+    _default, _default_lock = None, threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def set_event_log(log):
+    """Make `log` the process-wide event log (None turns logging off); returns the previous one, flushed."""
+    global _default
+    with _default_lock:
+        previous, _default = _default, log if log is not None else EventLog(None)
+    if previous is not None:
+        previous.flush()
+    return previous
+
+
+def load_events(path=EVENT_LOG_PATH, event=None, level=None):
+    """One row per event, batches expanded, optionally only one event type and levels at or above `level`."""
+    if path.endswith(".db"):
+        frame = pd.read_sql_query("SELECT * FROM events ORDER BY ts", get_connection(path, SCHEMA))
+        records = [{"ts": row.ts, "level": row.level, "event": row.event, **json.loads(row.data)}
+                   for row in frame.itertuples()]
+    elif os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    else:
+        records = []
+    if event is not None:
+        records = [record for record in records if record["event"] == event]
+    if level is not None:
+        records = [record for record in records if LEVELS.get(record["level"], OFF) >= _level(level)]
+
+    rows = []
+    for record in records:
+        n = record.pop("_count", None)
+        if n is None:
+            rows.append(record)
+            continue
+        head = {key: record.pop(key) for key in ("ts", "level", "event")}
+        rows.extend({**head, **dict(zip(record, values))} for values in zip(*record.values()))
+    return pd.DataFrame(rows)
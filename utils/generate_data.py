@@ -1,17 +1,102 @@
+import argparse
+import os
+
+import numpy as np
 import pandas as pd
-import random
-
-def generate_backlog():
-    backlog = []
-    for i in range(50):
-        backlog.append({
-            "id": i,
-            "type": random.choice(["Feature", "Epic", "User Story"]),
-            "priority": random.randint(1, 5),
-            "estimated_effort": random.randint(1, 13)
-        })
-    return pd.DataFrame(backlog)
+
+ITEM_TYPES = ["Feature", "Epic", "User Story"]
+PRIORITIES = [1, 2, 3, 4, 5]
+EFFORT_RANGE = (1, 13)
+
+
+def _draw(rng, choices, weights, size):
+    # Draw `size` indices into `choices`, uniformly unless weights are given
+    if weights is None:
+        return rng.integers(0, len(choices), size=size)
+    p = np.asarray([weights.get(c, 0) for c in choices], dtype=np.float64)
+    if p.sum() <= 0:
+        raise ValueError("Distribution weights must sum to a positive value")
+    return rng.choice(len(choices), size=size, p=p / p.sum())
+
+
+def generate_backlog_columns(size, rng, start_id=0, type_weights=None,
+                             priority_weights=None, effort_weights=None,
+                             effort_range=EFFORT_RANGE, dependency_rate=0.0):
+    """Fill every backlog column in bulk and return them as a dict of arrays."""
+    type_codes = _draw(rng, ITEM_TYPES, type_weights, size)
+    priority = np.asarray(PRIORITIES, dtype=np.int8)[_draw(rng, PRIORITIES, priority_weights, size)]
+    if effort_weights is None:
+        low, high = effort_range
+        effort = rng.integers(low, high + 1, size=size, dtype=np.int32)
+    else:
+        values = sorted(effort_weights)
+        effort = np.asarray(values, dtype=np.int32)[_draw(rng, values, effort_weights, size)]
+
+    ids = np.arange(start_id, start_id + size, dtype=np.int64)
+    columns = {
+        "id": ids,
+        "type": pd.Categorical.from_codes(type_codes, categories=ITEM_TYPES),
+        "priority": priority,
+        "estimated_effort": effort,
+    }
+    if dependency_rate:
+        # Only depend on earlier ids so the generated graph stays acyclic
+        has_dependency = (rng.random(size) < dependency_rate) & (ids > 0)
+        upstream = (rng.random(size) * ids).astype(np.int64)
+        columns["depends_on"] = np.where(has_dependency, upstream, -1)
+    return columns
+
+
+def iter_backlog_chunks(size, chunk_size=100_000, seed=None, **distributions):
+    # Yield the backlog as DataFrames of at most `chunk_size` rows.
+    # The same (seed, chunk_size) pair always reproduces the same items.
+    rng = np.random.default_rng(seed)
+    for start in range(0, size, chunk_size):
+        n = min(chunk_size, size - start)
+        yield pd.DataFrame(generate_backlog_columns(n, rng, start_id=start, **distributions))
+
+
+def generate_backlog(size=50, seed=None, **distributions):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(generate_backlog_columns(size, rng, **distributions))
+
+
+def write_backlog(path="data/backlog.csv", size=50, chunk_size=100_000, seed=None, **distributions):
+    """Stream a generated backlog to CSV or Parquet without materializing it."""
+    chunks = iter_backlog_chunks(size, chunk_size=chunk_size, seed=seed, **distributions)
+
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Writing Parquet backlogs requires pyarrow") from e
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    with open(path, "w", newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, index=False, header=(i == 0))
+    return path
+
 
 if __name__ == "__main__":
-    backlog = generate_backlog()
-    backlog.to_csv("data/backlog.csv", index=False)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate a synthetic SAFe backlog")
+    parser.add_argument("--size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--dependency-rate", type=float, default=0.0)
+    parser.add_argument("--output", default=os.path.join("data", "backlog.csv"))
+    args = parser.parse_args()
+
+    write_backlog(args.output, size=args.size, chunk_size=args.chunk_size, seed=args.seed,
+                  dependency_rate=args.dependency_rate)
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import time
+
+from utils.database import get_connection
+
+CACHE_PATH = "data/llm_cache.db"
+MAX_BYTES = 64 * 1024 * 1024
+
+# Set SAFE_LLM_CACHE=off to bypass the cache without touching code
+CACHE_ENV = "SAFE_LLM_CACHE"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access);
+"""
+
+LLM_PARAMS = ("model", "base_url", "temperature", "top_p", "top_k", "max_tokens", "seed")
+
+
+def _digest(payload):
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def llm_fingerprint(llm):
+    """Model parameters that change what an LLM answers."""
+    if llm is None:
+        return None
+    if isinstance(llm, str):
+        return {"model": llm}
+    params = {name: getattr(llm, name, None) for name in LLM_PARAMS}
+    params.update(getattr(llm, "additional_params", None) or {})
+    return params
+
+
+def agent_fingerprint(agent):
+    return {
+        "role": agent.role,
+        "goal": agent.goal,
+        "backstory": agent.backstory,
+        "tools": sorted((tool.name, tool.description) for tool in (agent.tools or [])),
+        "max_iter": getattr(agent, "max_iter", None),
+        "llm": llm_fingerprint(getattr(agent, "llm", None)),
+    }
+
+
+def task_keys(tasks, sequential=True):
+    """Content address of every task, chained through its upstream context.
+
+    A task's key covers its agent, description, expected_output and the keys
+    of the tasks whose output it sees: the explicit `context` tasks, or the
+    previous task for a sequential crew. Changing anything upstream therefore
+    changes every key downstream of it.
+    """
+    keys = {}
+    previous = None
+    for task in tasks:
+        context = getattr(task, "context", None)
+        if isinstance(context, (list, tuple)):
+            upstream = [keys[id(t)] for t in context if id(t) in keys]
+        else:
+            upstream = [previous] if sequential and previous else []
+        keys[id(task)] = previous = _digest({
+            "agent": agent_fingerprint(task.agent) if task.agent else None,
+            "description": task.description,
+            "expected_output": task.expected_output,
+            "tools": sorted(tool.name for tool in (task.tools or [])),
+            "upstream": upstream,
+        })
+    return [keys[id(task)] for task in tasks]
+
+
+def crew_key(crew):
+    sequential = str(getattr(crew, "process", "sequential")).endswith("sequential")
+    return _digest({"process": str(getattr(crew, "process", "")), "tasks": task_keys(crew.tasks, sequential)})
+
+
+def crew_output_to_dict(output):
+    # Plain JSON-able form of a CrewOutput; also what the pages display
+    return {
+        "raw": getattr(output, "raw", str(output)),
+        "tasks": [
+            {
+                "description": task.description,
+                "agent": getattr(task, "agent", None),
+                "result": task.raw,
+            }
+            for task in (getattr(output, "tasks_output", None) or [])
+        ],
+    }
+
+
+class ResponseCache:
+    """Size-bounded LRU store of LLM results keyed by content hash."""
+
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    @property
+    def conn(self):
+        return get_connection(self.path, schema=SCHEMA)
+
+    def get(self, key):
+        row = self.conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        blob = json.dumps(value, default=str)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                              (key, blob, len(blob), time.time()))
+            # Evict least recently used entries beyond the size budget
+            self.conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_access DESC, key) AS running
+                        FROM responses
+                    ) WHERE running > ?
+                )""", (self.max_bytes,))
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM responses")
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+def cache_enabled():
+    return os.getenv(CACHE_ENV, "on").lower() not in ("0", "off", "false", "no")
+
+
+def cached_kickoff(crew, cache=None, bypass=False, inputs=None):
+    """Run `crew.kickoff()` unless an identical crew has already been run.
+
+    Returns the result as a dict with `raw` and per-task `tasks` entries,
+    whether it came from the cache or from the LLMs. `bypass=True` always
+    runs the crew and refreshes the entry; SAFE_LLM_CACHE=off skips the
+    cache entirely.
+    """
+    if not cache_enabled():
+        output = crew.kickoff(inputs=inputs) if inputs else crew.kickoff()
+        return {**crew_output_to_dict(output), "cached": False}
+
+    if cache is None:
+        cache = ResponseCache()
+    key = crew_key(crew) if not inputs else _digest({"crew": crew_key(crew), "inputs": inputs})
+    if not bypass:
+        hit = cache.get(key)
+        if hit is not None:
+            return {**hit, "cached": True}
+
+    output = crew.kickoff(inputs=inputs) if inputs else crew.kickoff()
+    result = crew_output_to_dict(output)
+    cache.put(key, result)
+    return {**result, "cached": False}
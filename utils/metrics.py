@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+
+def group_progress(progress, field, codes, num_teams):
+    """Sum one field of sprint_progress per team code with a single bincount."""
+    values = np.fromiter((item.get(field, 0) for item in progress), dtype=np.float64, count=len(progress))
+    return np.bincount(codes, weights=values, minlength=num_teams)
+
+
+class PerformanceMetrics:
+    """Rolling per-team delivery statistics, updated one sprint at a time.
+
+    Each `update` folds a sprint into running totals, a Welford mean/variance
+    of velocity and a ring buffer of the last `window` sprints, so the cost of
+    a sprint does not grow with the number of sprints already seen.
+    """
+
+    def __init__(self, window=5):
+        self.window = window
+        self.teams = []
+        self._codes = {}
+        self.sprints = np.zeros(0, dtype=np.int64)
+        self._recent = np.zeros((0, window))
+        self._mean = np.zeros(0)
+        self._m2 = np.zeros(0)
+        self._points = np.zeros(0)
+        self._planned = np.zeros(0)
+        self._items = np.zeros(0)
+
+    @classmethod
+    def from_history(cls, historical_velocity, window=5):
+        # Seed from per-team velocity lists such as {"Team 1": [18, 22, 20]}
+        metrics = cls(window)
+        longest = max((len(v) for v in historical_velocity.values()), default=0)
+        for i in range(longest):
+            metrics.update([
+                {"team": team, "points": velocities[i], "planned": velocities[i]}
+                for team, velocities in historical_velocity.items() if i < len(velocities)
+            ])
+        return metrics
+
+    def team_codes(self, names):
+        new = [name for name in dict.fromkeys(names) if name not in self._codes]
+        if new:
+            for name in new:
+                self._codes[name] = len(self.teams)
+                self.teams.append(name)
+            grow = len(new)
+            self.sprints = np.r_[self.sprints, np.zeros(grow, dtype=np.int64)]
+            self._recent = np.vstack([self._recent, np.zeros((grow, self.window))])
+            for attr in ("_mean", "_m2", "_points", "_planned", "_items"):
+                setattr(self, attr, np.r_[getattr(self, attr), np.zeros(grow)])
+        return np.fromiter((self._codes[name] for name in names), dtype=np.int64, count=len(names))
+
+    def update(self, progress):
+        """Fold one sprint of `sprint_progress` rows into the rolling statistics.
+
+        Rows need a `team` and use `points` (effort delivered), `planned`
+        (effort committed) and `completed` (items delivered) when present.
+        """
+        codes = self.team_codes([item['team'] for item in progress])
+        n = len(self.teams)
+        points = group_progress(progress, "points", codes, n)
+        planned = group_progress(progress, "planned", codes, n)
+        items = group_progress(progress, "completed", codes, n)
+        seen = np.flatnonzero(np.bincount(codes, minlength=n))
+
+        x = points[seen]
+        self._recent[seen, self.sprints[seen] % self.window] = x
+        self.sprints[seen] += 1
+        delta = x - self._mean[seen]
+        self._mean[seen] += delta / self.sprints[seen]
+        self._m2[seen] += delta * (x - self._mean[seen])
+        self._points[seen] += x
+        self._planned[seen] += planned[seen]
+        self._items[seen] += items[seen]
+
+    def summary(self):
+        sprints = np.maximum(self.sprints, 1)
+        variance = np.where(self.sprints > 1, self._m2 / np.maximum(self.sprints - 1, 1), 0.0)
+        return pd.DataFrame({
+            "team": self.teams,
+            "sprints": self.sprints,
+            "rolling_velocity": self._recent.sum(axis=1) / np.minimum(sprints, self.window),
+            "velocity_mean": self._mean,
+            "velocity_std": np.sqrt(variance),
+            "predictability": np.divide(self._points, self._planned, out=np.zeros(len(self.teams)),
+                                        where=self._planned > 0),
+            "throughput": self._items / sprints,
+        })
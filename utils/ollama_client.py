@@ -0,0 +1,118 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+OLLAMA_URL = "http://localhost:11434"
+
+# How long the last health/model check is trusted; failures are retried sooner
+# so the page recovers quickly once `ollama serve` is started
+HEALTH_TTL = 30.0
+FAILURE_TTL = 3.0
+KEEP_ALIVE = "30m"
+# Loading a model from disk can take minutes on a cold machine
+LOAD_TIMEOUT = 300.0
+
+
+class OllamaClient:
+    """Shared Ollama HTTP client with a keep-alive connection pool.
+
+    Health and model-list results are cached for `ttl` seconds so Streamlit
+    reruns don't hit the server on every interaction. `warm_up` preloads a
+    model in the background so the first crew call doesn't pay the load.
+    """
+
+    def __init__(self, base_url=OLLAMA_URL, ttl=HEALTH_TTL, failure_ttl=FAILURE_TTL,
+                 timeout=(1.0, 10.0), pool_size=4):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._warming = {}
+
+    def _cached(self, key, fetch, ok=bool):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+        value = fetch()
+        ttl = self.ttl if ok(value) else self.failure_ttl
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, value)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _get(self, path):
+        response = self.session.get(self.base_url + path, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def is_healthy(self):
+        def fetch():
+            try:
+                return self._get("/").status_code == 200
+            except requests.RequestException:
+                return False
+        return self._cached("health", fetch)
+
+    def list_models(self):
+        """Names of locally available models, or None if the server can't be reached."""
+        def fetch():
+            try:
+                models = self._get("/api/tags").json().get("models", [])
+            except (requests.RequestException, ValueError):
+                return None
+            return [m.get("model") or m.get("name") for m in models]
+        return self._cached("models", fetch, ok=lambda models: models is not None)
+
+    def has_model(self, name):
+        models = self.list_models()
+        if models is None:
+            raise ConnectionError(f"Could not list models from {self.base_url}")
+        return any(model.startswith(name) for model in models)
+
+    def warm_up(self, model, keep_alive=KEEP_ALIVE, background=True):
+        """Load `model` into memory and keep it resident for `keep_alive`.
+
+        An empty generate request only loads the model. Repeated calls within
+        the TTL are no-ops; with `background=True` the request runs on a
+        daemon thread, which is returned.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._warming.get(model, 0) > now:
+                return None
+            self._warming[model] = now + self.ttl
+
+        def load():
+            try:
+                self.session.post(
+                    self.base_url + "/api/generate",
+                    json={"model": model, "keep_alive": keep_alive},
+                    timeout=(self.timeout[0], LOAD_TIMEOUT),
+                ).raise_for_status()
+            except requests.RequestException:
+                # Let the next call try again
+                with self._lock:
+                    self._warming.pop(model, None)
+
+        if not background:
+            load()
+            return None
+        thread = threading.Thread(target=load, name=f"ollama-warm-up-{model}", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        self.session.close()
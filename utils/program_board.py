@@ -0,0 +1,129 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from utils.dependency_graph import DependencyGraph
+
+UNSCHEDULED = -1
+
+
+class ProgramBoard:
+    """Sprint x team view of a scheduled PI.
+
+    `sprint` maps every backlog row to the sprint its feature is delivered in
+    (UNSCHEDULED when it is not on the board); `count` and `load` are
+    (num_sprints, num_teams) matrices of delivered features and spent effort.
+    """
+
+    def __init__(self, teams, sprint, count, load, capacity, unscheduled):
+        self.teams = teams
+        self.sprint = sprint
+        self.count = count
+        self.load = load
+        self.capacity = capacity
+        self.unscheduled = unscheduled
+
+    @property
+    def num_sprints(self):
+        return self.count.shape[0]
+
+    def to_frame(self, values="count"):
+        matrix = self.count if values == "count" else self.load
+        return pd.DataFrame(
+            matrix,
+            index=[f"Sprint {s + 1}" for s in range(self.num_sprints)],
+            columns=self.teams,
+        )
+
+
+def schedule_program_board(backlog, teams, graph=None, rows=None, num_sprints=5):
+    """Place features into sprints in dependency order without overloading teams.
+
+    Ready features are popped from a heap by (priority, -effort). Each one
+    lands in the first sprint after all of its dependencies are delivered,
+    spilling over into later sprints of the same team when it is larger than
+    what is left in one. Features that do not fit in the PI, or that wait on
+    one that does not, are reported as unscheduled. The heap costs
+    O((V + E) log V); checking and filling a team's remaining sprints adds
+    O(S) per feature, so O((V + E) log V + V * S) for S sprints.
+    """
+    if graph is None:
+        graph = DependencyGraph.from_backlog(backlog)
+    if rows is None:
+        rows = backlog.where(type="Feature")
+    rows = np.asarray(rows, dtype=np.int64)
+    n = len(backlog)
+
+    # Column of every backlog team code on the board, -1 for teams not on it
+    team_names = [team['name'] for team in teams]
+    codes = [backlog.team_code(name) for name in team_names]
+    column = np.full(len(backlog.teams) + 1, -1, dtype=np.int64)
+    column[codes] = np.arange(len(codes))
+    columns = column[backlog.assigned_team[rows]].tolist()
+
+    velocity = np.asarray([team['velocity'] for team in teams], dtype=np.float64)
+    capacity = np.tile(velocity, (num_sprints, 1))
+    remaining = capacity.tolist()
+
+    # Only dependencies between board features constrain the schedule
+    on_board = np.zeros(n, dtype=bool)
+    on_board[rows] = True
+    sources, targets = graph.edges()
+    internal = on_board[sources] & on_board[targets]
+    indegree = np.bincount(targets[internal], minlength=n).tolist()
+
+    slot = {row: i for i, row in enumerate(rows.tolist())}
+    effort = backlog.estimated_effort[rows].tolist()
+    priority = backlog.priority[rows].tolist()
+    earliest = [0] * len(rows)
+    blocked = [False] * len(rows)
+    sprint = np.full(n, UNSCHEDULED, dtype=np.int64)
+    count = np.zeros((num_sprints, len(teams)), dtype=np.int64)
+    unscheduled = []
+
+    ready = [(priority[i], -effort[i], row) for row, i in slot.items() if indegree[row] == 0]
+    heapq.heapify(ready)
+    while ready:
+        _, _, row = heapq.heappop(ready)
+        i = slot[row]
+        team = columns[i]
+        start = earliest[i]
+        placed = None
+
+        if not blocked[i] and team >= 0 and start < num_sprints and \
+                sum(remaining[s][team] for s in range(start, num_sprints)) >= effort[i]:
+            left = effort[i]
+            for s in range(start, num_sprints):
+                take = min(remaining[s][team], left)
+                remaining[s][team] -= take
+                left -= take
+                if left <= 0:
+                    placed = s
+                    break
+
+        if placed is None:
+            unscheduled.append(row)
+        else:
+            sprint[row] = placed
+            count[placed, team] += 1
+
+        for child in graph.successors(row):
+            j = slot.get(child)
+            if j is None:
+                continue
+            if placed is None:
+                blocked[j] = True
+            else:
+                earliest[j] = max(earliest[j], placed + 1)
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                heapq.heappush(ready, (priority[j], -effort[j], child))
+
+    # Features on a dependency cycle never become ready
+    waiting = [row for row in rows.tolist() if indegree[row] > 0]
+    unscheduled.extend(waiting)
+
+    load = capacity - np.asarray(remaining)
+    return ProgramBoard(team_names, sprint, count, load, capacity,
+                        backlog.id[np.asarray(unscheduled, dtype=np.int64)].tolist())
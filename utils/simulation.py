@@ -0,0 +1,94 @@
+import heapq
+
+import numpy as np
+
+# Event kinds, in the order they are handled within one day
+SPRINT_BOUNDARY, BLOCKER_RAISED, BLOCKER_RESOLVED, STANDUP, DEPENDENCY_SATISFIED, WORK_DONE = range(6)
+KINDS = ("sprint_boundary", "blocker_raised", "blocker_resolved", "standup", "dependency_satisfied", "work_done")
+
+
+class EventQueue:
+    """Pending events grouped into (day, kind) slots.
+
+    An event is just an integer target (a team, member or backlog row) and
+    an integer value. Scheduling appends whole arrays to a slot and the heap
+    holds one entry per slot, so a day with thousands of events of one kind
+    costs one heap push and pop, and is handed over as two arrays.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._slots = {}
+        self.scheduled = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, day, kind, targets, values=None):
+        targets = np.asarray(targets, dtype=np.int64).ravel()
+        if not len(targets):
+            return
+        values = np.zeros(len(targets), dtype=np.int64) if values is None else \
+            np.broadcast_to(np.asarray(values, dtype=np.int64), targets.shape)
+        slot = self._slots.get((day, kind))
+        if slot is None:
+            slot = self._slots[(day, kind)] = ([], [])
+            heapq.heappush(self._heap, (day, kind))
+        slot[0].append(targets)
+        slot[1].append(values)
+        self.scheduled += len(targets)
+
+    def next_day(self):
+        return self._heap[0][0] if self._heap else None
+
+    def pop(self):
+        """The earliest slot as (day, kind, targets, values)."""
+        day, kind = heapq.heappop(self._heap)
+        targets, values = self._slots.pop((day, kind))
+        if len(targets) == 1:
+            return day, kind, targets[0], values[0]
+        return day, kind, np.concatenate(targets), np.concatenate(values)
+
+
+class Simulation:
+    """Day-granularity discrete-event loop.
+
+    Handlers are registered per kind with `on` and called as
+    `handler(sim, targets, values)` once per (day, kind) batch; they read
+    `sim.now` and schedule follow-up events with `sim.schedule`. Time never
+    runs backwards: an event scheduled for today is still handled today,
+    after the batch that scheduled it.
+    """
+
+    def __init__(self, start=0):
+        self.now = start
+        self.queue = EventQueue()
+        self.handlers = {}
+        self.handled = np.zeros(len(KINDS), dtype=np.int64)
+        self.batches = 0
+
+    def on(self, kind, handler):
+        self.handlers.setdefault(kind, []).append(handler)
+        return handler
+
+    def schedule(self, day, kind, targets, values=None):
+        if day < self.now:
+            raise ValueError(f"Cannot schedule {KINDS[kind]} for day {day}, it is already day {self.now}")
+        self.queue.schedule(day, kind, targets, values)
+
+    def step(self):
+        self.now, kind, targets, values = self.queue.pop()
+        self.handled[kind] += len(targets)
+        self.batches += 1
+        for handler in self.handlers.get(kind, ()):
+            handler(self, targets, values)
+
+    def run(self, until=None):
+        """Handle events until the queue is empty or the next one is after day `until`."""
+        while self.queue and (until is None or self.queue.next_day() <= until):
+            self.step()
+        return self
+
+    def stats(self):
+        return {"days": self.now, "batches": self.batches,
+                **{kind: int(count) for kind, count in zip(KINDS, self.handled.tolist())}}
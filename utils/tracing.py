@@ -0,0 +1,163 @@
+import functools
+import json
+import threading
+import uuid
+
+import pandas as pd
+
+from utils.database import get_connection
+
+TRACE_PATH = "data/traces.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spans (
+    run_id TEXT NOT NULL,
+    span_id TEXT NOT NULL,
+    parent_id TEXT,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    task TEXT,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    attrs TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_spans_run ON spans (run_id, start);
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def span_events():
+    """Span kind for each crewai start event, and the events that end it."""
+    from crewai import events
+
+    return {
+        "task": (events.TaskStartedEvent, (events.TaskCompletedEvent, events.TaskFailedEvent)),
+        "agent": (events.AgentExecutionStartedEvent,
+                  (events.AgentExecutionCompletedEvent, events.AgentExecutionErrorEvent)),
+        "llm": (events.LLMCallStartedEvent, (events.LLMCallCompletedEvent, events.LLMCallFailedEvent)),
+        "tool": (events.ToolUsageStartedEvent, (events.ToolUsageFinishedEvent, events.ToolUsageErrorEvent)),
+    }
+
+
+def _task_id(event):
+    # Agent events carry the task itself rather than its id
+    if event.task_id:
+        return event.task_id
+    task = getattr(event, "task", None)
+    return str(task.id) if task is not None else None
+
+
+def _span_name(kind, event):
+    if kind == "tool":
+        return event.tool_name
+    if kind == "llm":
+        return event.model or "llm"
+    if kind == "agent":
+        return event.agent_role or getattr(getattr(event, "agent", None), "role", None) or "agent"
+    return event.task_name or "task"
+
+
+class CrewTracer:
+    """Collects timing spans for one crew run from crewai's event bus.
+
+    Use as a context manager around `kickoff()` or `run_task_dag` (pass it as
+    `tracer` to also get queue-wait spans). Records a span for every task,
+    agent execution, tool run and LLM request of `tasks`, with token usage on
+    LLM spans and the agent iteration each LLM call belongs to. Spans are
+    written to SQLite when the block exits.
+    """
+
+    def __init__(self, tasks, run_id=None, path=TRACE_PATH):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.path = path
+        self.task_names = {str(task.id): task.description for task in tasks}
+        self.spans = []
+        self._open = {}
+        self._iterations = {}
+        self._lock = threading.Lock()
+        self._handlers = []
+
+    def _on_start(self, kind):
+        def handler(source, event):
+            if _task_id(event) not in self.task_names:
+                return
+            with self._lock:
+                self._open[event.event_id] = (kind, event)
+        return handler
+
+    def _on_end(self, source, event):
+        with self._lock:
+            opened = self._open.pop(event.started_event_id, None)
+        if opened is None:
+            return
+        kind, start = opened
+        task_id = _task_id(start)
+        attrs = {"failed": not isinstance(event, span_events()[kind][1][0])}
+        usage = getattr(event, "usage", None) or {}
+        if kind == "llm":
+            # Each LLM call in a task's loop is one agent iteration (bounded by max_iter)
+            with self._lock:
+                attrs["iteration"] = self._iterations[task_id] = self._iterations.get(task_id, 0) + 1
+        self.record(
+            kind, _span_name(kind, start), start.timestamp.timestamp(), event.timestamp.timestamp(),
+            task=self.task_names.get(task_id), span_id=start.event_id, parent_id=start.parent_event_id,
+            prompt_tokens=usage.get("prompt_tokens"), completion_tokens=usage.get("completion_tokens"), **attrs,
+        )
+
+    def record(self, kind, name, start, end, task=None, span_id=None, parent_id=None,
+               prompt_tokens=None, completion_tokens=None, **attrs):
+        """Add a span; times are epoch seconds."""
+        with self._lock:
+            self.spans.append((self.run_id, span_id or uuid.uuid4().hex, parent_id, kind, name, task, start, end,
+                               prompt_tokens, completion_tokens, json.dumps(attrs, default=str)))
+
+    def __enter__(self):
+        for kind, (start_event, end_events) in span_events().items():
+            self._handlers.append((start_event, self._on_start(kind)))
+            self._handlers.extend((end_event, self._on_end) for end_event in end_events)
+        from crewai.events import crewai_event_bus
+
+        for event_type, handler in self._handlers:
+            crewai_event_bus.on(event_type)(handler)
+        return self
+
+    def __exit__(self, *exc):
+        from crewai.events import crewai_event_bus
+
+        # Handlers may still be running on the bus's worker threads
+        crewai_event_bus.flush()
+        for event_type, handler in self._handlers:
+            crewai_event_bus.off(event_type, handler)
+        self._handlers = []
+        self.flush()
+        return False
+
+    def flush(self):
+        with self._lock:
+            spans, self.spans = self.spans, []
+        if spans:
+            conn = get_connection(self.path, schema=SCHEMA)
+            with conn:
+                conn.executemany("INSERT INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", spans)
+        return len(spans)
+
+
+def load_spans(run_id, path=TRACE_PATH):
+    """Spans of one run with `offset`, `end_offset` and `duration` in seconds from its first span."""
+    frame = pd.read_sql_query("SELECT * FROM spans WHERE run_id = ? ORDER BY start", get_connection(path, schema=SCHEMA),
+                              params=(run_id,))
+    frame["offset"] = frame["start"] - frame["start"].min()
+    frame["duration"] = frame["end"] - frame["start"]
+    frame["end_offset"] = frame["offset"] + frame["duration"]
+    return frame
+
+
+def span_summary(spans):
+    """Total time, count and tokens per span kind and name."""
+    return (spans.groupby(["kind", "name"])
+            .agg(count=("duration", "size"), total_s=("duration", "sum"), mean_s=("duration", "mean"),
+                 prompt_tokens=("prompt_tokens", "sum"), completion_tokens=("completion_tokens", "sum"))
+            .reset_index().sort_values("total_s", ascending=False))
+
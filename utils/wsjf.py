@@ -0,0 +1,176 @@
+import heapq
+
+import numpy as np
+
+from utils.generate_data import PRIORITIES
+
+
+def wsjf(cost_of_delay, job_size):
+    """Weighted Shortest Job First: cost of delay per unit of job size, over whole arrays."""
+    cost_of_delay = np.asarray(cost_of_delay, dtype=np.float64)
+    job_size = np.maximum(np.asarray(job_size, dtype=np.float64), 1.0)
+    return cost_of_delay / job_size
+
+
+def cost_of_delay(business_value, time_criticality, risk_reduction):
+    return (np.asarray(business_value, dtype=np.float64) + np.asarray(time_criticality, dtype=np.float64)
+            + np.asarray(risk_reduction, dtype=np.float64))
+
+
+def priority_cost_of_delay(priority):
+    # Without value estimates, priority 1 is the costliest to delay
+    return max(PRIORITIES) + 1 - np.asarray(priority, dtype=np.float64)
+
+
+class WSJFQueue:
+    """Backlog items in WSJF order, kept as an indexed binary max-heap.
+
+    Items are backlog rows (or any hashable ids). Scores are computed for
+    the whole batch with NumPy and the heap is built from one sort; after
+    that `update` re-scores a single item and restores the heap in O(log n)
+    instead of re-sorting the backlog. Ties go to the smaller item, so the
+    order is deterministic. `top_k` and `select` read the best items without
+    disturbing the heap.
+    """
+
+    def __init__(self, items, cost_of_delay, job_size):
+        items = np.asarray(items)
+        cod = np.asarray(cost_of_delay, dtype=np.float64)
+        size = np.asarray(job_size, dtype=np.float64)
+        score = wsjf(cod, size)
+        order = np.lexsort((items, -score))
+        # A sorted array already satisfies the heap property
+        self.heap = items[order].tolist()
+        self.pos = {item: i for i, item in enumerate(self.heap)}
+        keys = items.tolist()
+        self.cod = dict(zip(keys, cod.tolist()))
+        self.size = dict(zip(keys, size.tolist()))
+        self.score = dict(zip(keys, score.tolist()))
+
+    @classmethod
+    def from_backlog(cls, backlog, rows=None, cost_of_delay=None):
+        """Queue over backlog `rows` (default all); cost of delay defaults to one derived from priority."""
+        rows = np.arange(len(backlog)) if rows is None else np.asarray(rows, dtype=np.int64)
+        if cost_of_delay is None:
+            cost_of_delay = priority_cost_of_delay(backlog.priority[rows])
+        return cls(rows, cost_of_delay, backlog.estimated_effort[rows])
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.pos
+
+    def _before(self, a, b):
+        sa, sb = self.score[a], self.score[b]
+        return sa > sb or (sa == sb and a < b)
+
+    def _place(self, item, i):
+        self.heap[i] = item
+        self.pos[item] = i
+
+    def _sift_up(self, i):
+        heap, item = self.heap, self.heap[i]
+        while i:
+            parent = (i - 1) // 2
+            if not self._before(item, heap[parent]):
+                break
+            self._place(heap[parent], i)
+            i = parent
+        self._place(item, i)
+
+    def _sift_down(self, i):
+        heap, item, n = self.heap, self.heap[i], len(self.heap)
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and self._before(heap[child + 1], heap[child]):
+                child += 1
+            if not self._before(heap[child], item):
+                break
+            self._place(heap[child], i)
+            i = child
+        self._place(item, i)
+
+    def push(self, item, cost_of_delay, job_size):
+        if item in self.pos:
+            return self.update(item, cost_of_delay, job_size)
+        self.cod[item], self.size[item] = float(cost_of_delay), float(job_size)
+        self.score[item] = self.cod[item] / max(self.size[item], 1.0)
+        self.heap.append(item)
+        self.pos[item] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def update(self, item, cost_of_delay=None, job_size=None):
+        """Re-score one item after its value or effort changed; O(log n)."""
+        if cost_of_delay is not None:
+            self.cod[item] = float(cost_of_delay)
+        if job_size is not None:
+            self.size[item] = float(job_size)
+        old, self.score[item] = self.score[item], self.cod[item] / max(self.size[item], 1.0)
+        i = self.pos[item]
+        if self.score[item] > old:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def remove(self, item):
+        i = self.pos.pop(item)
+        last = self.heap.pop()
+        if i < len(self.heap):
+            self._place(last, i)
+            self._sift_up(i)
+            self._sift_down(self.pos[last])
+        del self.cod[item], self.size[item], self.score[item]
+
+    def peek(self):
+        return self.heap[0]
+
+    def pop(self):
+        item = self.heap[0]
+        self.remove(item)
+        return item
+
+    def _best_first(self):
+        # Walk the heap in order with a frontier of candidate nodes: O(k log k) for the first k items
+        if not self.heap:
+            return
+        heap, score, n = self.heap, self.score, len(self.heap)
+        frontier = [(-score[heap[0]], heap[0], 0)]
+        while frontier:
+            _, item, i = heapq.heappop(frontier)
+            yield item
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n:
+                    heapq.heappush(frontier, (-score[heap[child]], heap[child], child))
+
+    def top_k(self, k):
+        """The k highest-WSJF items, best first, leaving the queue unchanged."""
+        items = []
+        for item in self._best_first():
+            if len(items) >= k:
+                break
+            items.append(item)
+        return items
+
+    def select(self, capacity, max_examined=None):
+        """Items for a sprint of `capacity` points: best WSJF first, skipping any that no longer fit.
+
+        Costs O(m log m) for the m items examined. m is close to the number
+        selected when the best items fit, but skipped items count too, so
+        it reaches the whole queue, O(n log n), when most items are larger
+        than the capacity left. `max_examined` caps m for such backlogs.
+        """
+        selected = []
+        for examined, item in enumerate(self._best_first()):
+            if capacity < 1 or (max_examined is not None and examined >= max_examined):
+                break
+            if self.size[item] <= capacity:
+                selected.append(item)
+                capacity -= self.size[item]
+        return selected
+
+    def order(self):
+        """Every item in WSJF order."""
+        return list(self._best_first())
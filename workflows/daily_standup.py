@@ -1,18 +1,25 @@
 from agents.scrum_master import ScrumMaster
 from agents.rte import ReleaseTrainEngineer
 
-def run_daily_standup(teams):
-    rte = ReleaseTrainEngineer()
+def run_daily_standup(teams, rte=None, board=None, day=0, batch_size=None, log=None):
+    # With a BlockerBoard, blockers are tracked across days and the RTE works
+    # through at most `batch_size` of the most severe, oldest ones per day
+    rte = rte or ReleaseTrainEngineer.pooled()
     blockers = []
 
     # Each Scrum Master gathers updates from their team
     for team in teams:
-        scrum_master = ScrumMaster(team)
-        team_blockers = scrum_master.run_standup()
+        scrum_master = ScrumMaster.for_team(team)
+        team_blockers = scrum_master.run_standup(team)
         blockers.extend(team_blockers)
 
     # RTE resolves major blockers across teams
-    if blockers:
-        rte.resolve_risks(blockers)
+    if board is not None:
+        board.ingest(blockers, day, reported_teams=[team['name'] for team in teams])
+        escalated = board.drain(batch_size, day)
+        if escalated:
+            rte.resolve_risks([blocker.to_dict() for blocker in escalated], log=log)
+    elif blockers:
+        rte.resolve_risks(blockers, log=log)
 
     return blockers
\ No newline at end of file
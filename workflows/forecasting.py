@@ -0,0 +1,130 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import numpy as np
+import pandas as pd
+
+# Upper bound on the runs x items x sprints booleans held by one chunk
+_CHUNK_CELLS = 1 << 24
+PERCENTILES = (50, 85, 95)
+
+
+def _simulate_chunk(runs, seed, velocity, spread, num_sprints, team_of, position, edges):
+    # One batch of realizations; returns histograms so chunks merge by addition
+    rng = np.random.default_rng(seed)
+    low = np.maximum(velocity - spread, 0)
+    work = rng.integers(low[:, None], (velocity + spread + 1)[:, None], size=(runs, len(velocity), num_sprints))
+    cumulative = work.cumsum(axis=2, dtype=np.int32)
+
+    # Sprint in which each item's queue position is covered; num_sprints = after the PI
+    finish = np.zeros((runs, len(team_of)), dtype=np.int16)
+    for sprint in range(num_sprints):
+        finish += cumulative[:, :, sprint][:, team_of] < position
+
+    # An item cannot be delivered before the sprint after its dependencies
+    for parents, children in edges:
+        np.maximum.at(finish, (slice(None), children), (finish[:, parents] + 1).astype(finish.dtype))
+    np.minimum(finish, num_sprints, out=finish)
+
+    bins = num_sprints + 1
+    finish_hist = np.bincount((np.arange(finish.shape[1]) * bins + finish).ravel(),
+                              minlength=finish.shape[1] * bins).reshape(-1, bins)
+
+    totals = work.sum(axis=2) - low * num_sprints
+    width = 2 * spread * num_sprints + 1
+    velocity_hist = np.bincount((np.arange(len(velocity)) * width + totals).ravel(),
+                                minlength=len(velocity) * width).reshape(-1, width)
+
+    all_done = int((finish < num_sprints).all(axis=1).sum()) if finish.shape[1] else runs
+    return finish_hist, velocity_hist, all_done
+
+
+def _histogram_percentiles(hist, percentiles, values):
+    # First value whose cumulative share reaches each percentile, per histogram row
+    cdf = np.cumsum(hist, axis=1) / np.maximum(hist.sum(axis=1, keepdims=True), 1)
+    return {p: values[np.argmax(cdf >= p / 100 - 1e-12, axis=1)] for p in percentiles}
+
+
+def forecast_pi(teams, backlog, runs=10_000, num_sprints=5, rows=None, graph=None,
+                spread=2, seed=None, workers=None):
+    """Monte Carlo forecast of `runs` sprint/PI realizations.
+
+    Team velocity per sprint is drawn like `execute_sprint` (velocity +/- spread)
+    as a runs x teams x sprints array. Each team works its open queue in
+    backlog order, optionally delayed by `graph` dependencies. Set
+    num_sprints=1 for a single-sprint forecast. `workers` > 1 splits the runs
+    over a process pool.
+
+    Returns a dict with the PI completion probability, a per-feature frame
+    (completion probability and P50/P85/P95 finish sprint, NaN meaning after
+    the PI), a per-team PI velocity distribution and the expected number of
+    forecast items delivered by the end of each sprint.
+    """
+    codes = np.asarray([backlog.team_code(team['name']) for team in teams], dtype=np.int64)
+    velocity = np.asarray([team['velocity'] for team in teams], dtype=np.int64)
+
+    # Position of every open item in its team's queue
+    queue_rows, queue_teams, _, spent_after = backlog.team_queues()
+    column = np.full(len(backlog.teams), -1, dtype=np.int64)
+    column[codes] = np.arange(len(codes))
+    on_train = column[queue_teams] >= 0
+    queue_rows, team_of, position = queue_rows[on_train], column[queue_teams[on_train]], spent_after[on_train]
+
+    if rows is None:
+        rows = queue_rows[backlog.mask(type="Feature")[queue_rows]]
+    slot = np.full(len(backlog), -1, dtype=np.int64)
+    slot[queue_rows] = np.arange(len(queue_rows))
+    rows = np.asarray(rows, dtype=np.int64)
+    rows = rows[slot[rows] >= 0]
+
+    # Dependency edges between queued items, grouped by the level of the parent
+    edges = []
+    if graph is not None:
+        for level in graph.levels():
+            parents, children = graph.out_edges(level[slot[level] >= 0])
+            queued = slot[children] >= 0
+            if queued.any():
+                edges.append((slot[parents[queued]], slot[children[queued]]))
+
+    chunk = max(1, _CHUNK_CELLS // max(1, len(queue_rows) * num_sprints))
+    sizes = [min(chunk, runs - start) for start in range(0, runs, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(size, s, velocity, spread, num_sprints, team_of, position, edges) for size, s in zip(sizes, seeds)]
+
+    if workers is None:
+        workers = min(len(sizes), os.cpu_count() or 1) if runs * len(queue_rows) > _CHUNK_CELLS else 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_chunk, *zip(*args)))
+    else:
+        results = [_simulate_chunk(*a) for a in args]
+
+    finish_hist = sum(r[0] for r in results)[slot[rows]]
+    velocity_hist = sum(r[1] for r in results)
+    all_done = sum(r[2] for r in results)
+
+    sprint_labels = np.r_[np.arange(1, num_sprints + 1), np.nan]
+    finish_pct = _histogram_percentiles(finish_hist, PERCENTILES, sprint_labels)
+    features = pd.DataFrame({
+        "id": backlog.id[rows],
+        "team": [teams[t]['name'] for t in team_of[slot[rows]].tolist()],
+        "completion_probability": finish_hist[:, :num_sprints].sum(axis=1) / runs,
+        **{f"p{p}_sprint": finish_pct[p] for p in PERCENTILES},
+    })
+
+    low = np.maximum(velocity - spread, 0) * num_sprints
+    totals = low[:, None] + np.arange(velocity_hist.shape[1])[None, :]
+    velocity_pct = _histogram_percentiles(velocity_hist, (15, 50, 85), np.arange(velocity_hist.shape[1]))
+    velocity_frame = pd.DataFrame({
+        "team": [team['name'] for team in teams],
+        "mean": (velocity_hist * totals).sum(axis=1) / runs,
+        **{f"p{p}": low + velocity_pct[p] for p in (15, 50, 85)},
+    })
+
+    return {
+        "runs": runs,
+        "pi_completion_probability": all_done / runs,
+        "features": features,
+        "velocity": velocity_frame,
+        "expected_completed_by_sprint": finish_hist[:, :num_sprints].cumsum(axis=1).sum(axis=0) / runs,
+    }
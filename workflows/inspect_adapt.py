@@ -1,12 +1,27 @@
 from agents.rte import ReleaseTrainEngineer
 
-def run_inspect_and_adapt(teams, progress):
-    rte = ReleaseTrainEngineer()
+def run_inspect_and_adapt(teams, progress, backlog=None, history=None, rte=None):
+    rte = rte or ReleaseTrainEngineer.pooled()
 
     # Collect metrics and performance data
     metrics = rte.evaluate_performance(teams, progress)
 
+    # Completed items per team come straight from the backlog columns
+    if backlog is not None:
+        for metric in metrics:
+            backlog.team_code(metric['team'])
+        completed = backlog.group_count(rows=backlog.mask(status="Completed"))
+        for metric in metrics:
+            metric['completed_items'] = int(completed[backlog.team_code(metric['team'])])
+
+    # Fold this sprint into the rolling history instead of recomputing it
+    if history is not None:
+        history.update(progress)
+        rolling = history.summary().set_index("team").to_dict("index")
+        for metric in metrics:
+            metric.update(rolling.get(metric['team'], {}))
+
     # Identify areas for improvement
     recommendations = rte.provide_recommendations(metrics)
 
-    return metrics, recommendations
\ No newline at end of file
+    return metrics, recommendations
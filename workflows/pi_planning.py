@@ -1,23 +1,45 @@
 from agents.rte import ReleaseTrainEngineer
-from agents.scrum_master import ScrumMaster
+from utils.dependency_graph import DependencyGraph
+from utils.event_log import get_event_log
+from utils.program_board import schedule_program_board
 
-def run_pi_planning(backlog, teams):
-    # Provide the required fields for RTE
-    rte = ReleaseTrainEngineer(
-        role="RTE",
-        goal="Deliver value",
-        backstory="Experienced RTE with a history of successful PI planning"
-    )
-    scrum_masters = [ScrumMaster(team) for team in teams]
+def run_pi_planning(backlog, teams, strategy="first_fit", num_sprints=5, rte=None, log=None, store=None, pi=1):
+    rte = rte or ReleaseTrainEngineer.pooled()
+    log = log or get_event_log()
 
     # Assign features to teams while considering dependencies and capacity
-    for feature in backlog[backlog['type'] == "Feature"].to_dict('records'):
-        assigned_team = rte.assign_feature(feature, teams)
-        print(f"Assigned Feature {feature['id']} to Team {assigned_team['name']}")
+    features = backlog.where(type="Feature")
+    assigned_teams, unassigned = rte.assign_features(backlog, features, teams, strategy)
+    if log.enabled("feature_assigned"):
+        placed = [i for i, team in enumerate(assigned_teams) if team is not None]
+        log.emit_batch("feature_assigned", feature_id=backlog.id[features[placed]],
+                       team=[assigned_teams[i]['name'] for i in placed])
+    log.emit_batch("feature_without_capacity", level="WARNING", feature_id=unassigned)
 
     # Identify and log dependencies
     dependencies = rte.identify_dependencies(backlog)
-    print(f"Dependencies Identified: {dependencies}")
+    if dependencies and log.enabled("dependency_identified"):
+        feature_ids, depends_on = zip(*dependencies)
+        log.emit_batch("dependency_identified", feature_id=feature_ids, depends_on=depends_on)
 
-    # Return updated backlog, team status, and dependency information
-    return backlog, teams, dependencies
\ No newline at end of file
+    graph = DependencyGraph.from_backlog(backlog)
+    cycles = [backlog.id[cycle].tolist() for cycle in graph.cycles()]
+    log.emit_batch("dependency_cycle", level="WARNING", feature_ids=cycles)
+
+    # Lay the assigned features out on the program board
+    board = schedule_program_board(backlog, teams, graph=graph, rows=features, num_sprints=num_sprints)
+    log.emit_batch("feature_unscheduled", level="WARNING", feature_id=board.unscheduled)
+    log.emit("pi_planned", features=len(features), unassigned=len(unassigned), dependencies=len(dependencies),
+             cycles=len(cycles), unscheduled=len(board.unscheduled))
+
+    # Planned load per team goes into the metrics store as sprint 0 of the PI
+    if store is not None:
+        planned = backlog.group_count(rows=features, minlength=len(backlog.teams))
+        effort = backlog.group_sum("estimated_effort", rows=features, minlength=len(backlog.teams))
+        for team in teams:
+            code = backlog.team_code(team['name'])
+            store.record(pi, 0, team['name'], {"planned_features": planned[code], "planned_effort": effort[code],
+                                               "capacity_left": team['capacity']})
+
+    # Return updated backlog, team status, dependency information and program board
+    return backlog, teams, dependencies, board
@@ -0,0 +1,247 @@
+import copy
+
+import numpy as np
+
+from agents.rte import ReleaseTrainEngineer
+from utils.backlog import STATUSES
+from utils.blockers import BlockerBoard
+from utils.dependency_graph import DependencyGraph
+from utils.event_log import get_event_log
+from utils.metrics import PerformanceMetrics
+from utils.simulation import (BLOCKER_RAISED, BLOCKER_RESOLVED, DEPENDENCY_SATISFIED, SPRINT_BOUNDARY, STANDUP,
+                              WORK_DONE, Simulation)
+from workflows.daily_standup import run_daily_standup
+from workflows.inspect_adapt import run_inspect_and_adapt
+from workflows.pi_planning import run_pi_planning
+
+COMPLETED = STATUSES.index("Completed")
+UNBLOCKED = -1
+
+
+class PISimulation:
+    """One PI of one release train, day by day on the discrete-event kernel.
+
+    PI planning assigns the features up front. Every day has a standup,
+    where reported blockers go onto a BlockerBoard and the RTE escalates up
+    to `escalations_per_day` of them (cleared the next day), followed by a
+    day of work per team scaled by the share of its members not blocked.
+    Members raise blockers at `blocker_rate` per day that clear by
+    themselves after `blocker_days`. Rows are only worked once their
+    dependencies are completed. Each sprint boundary closes the sprint like
+    `execute_sprint`; the last one runs Inspect & Adapt.
+
+    `remote_waits` are rows that also wait on items outside this backlog;
+    `satisfy` releases them and `take_completed` reports what finished, so
+    several trains can run side by side and sync in between `run` calls.
+    The simulation works on a copy of `teams`; the caller's records are not
+    changed. With a `store` (utils.database.MetricsStore), planning and
+    every closed sprint are recorded into it as PI `pi`.
+    """
+
+    def __init__(self, backlog, teams, num_sprints=5, sprint_days=10, rng=None, blocker_rate=0.02,
+                 blocker_days=(1, 5), escalations_per_day=3, remote_waits=None, rte=None, log=None, store=None,
+                 pi=1):
+        # Planning spends capacity and blockers are written onto members
+        teams = copy.deepcopy(teams)
+        self.rng = np.random.default_rng(rng)
+        self.rte = rte or ReleaseTrainEngineer.pooled()
+        self.log = log or get_event_log()
+        self.store = store
+        self.pi = pi
+        self.num_sprints = num_sprints
+        self.sprint_days = sprint_days
+        self.blocker_rate = blocker_rate
+        self.blocker_days = blocker_days
+        self.escalations_per_day = escalations_per_day
+        self.backlog, self.teams, _, _ = run_pi_planning(backlog, teams, num_sprints=num_sprints, rte=self.rte,
+                                                         log=self.log, store=store, pi=pi)
+        backlog = self.backlog
+
+        self.codes = np.asarray([backlog.team_code(team['name']) for team in teams], dtype=np.int64)
+        self.num_codes = len(backlog.teams)
+        self.velocity = np.asarray([team['velocity'] for team in teams], dtype=np.int64)
+
+        # Members are numbered across the train and hold at most one blocker at a time;
+        # blockers already in the team data stay until the RTE escalates them
+        self.members = [member for team in teams for member in team['members']]
+        self.member_team = np.repeat(self.codes, [len(team['members']) for team in teams])
+        self.team_size = np.bincount(self.member_team, minlength=self.num_codes)
+        self.blocked_since = np.full(len(self.members), UNBLOCKED, dtype=np.int64)
+        self.by_blocker = {}
+        for i, member in enumerate(self.members):
+            if "blocker" in member:
+                self.blocked_since[i] = 0
+                self.by_blocker.setdefault((backlog.teams[self.member_team[i]], member['blocker']), set()).add(i)
+
+        # A row is ready once every row it depends on is completed
+        self.graph = DependencyGraph.from_backlog(backlog)
+        parents, children = self.graph.edges()
+        self.unmet = np.bincount(children[backlog.status[parents] != COMPLETED], minlength=len(backlog))
+        if remote_waits is not None:
+            np.add.at(self.unmet, np.asarray(remote_waits, dtype=np.int64), 1)
+        self.ready = self.unmet == 0
+
+        self.board = BlockerBoard()
+        self.history = PerformanceMetrics()
+        self.sprints = []
+        self.metrics, self.recommendations = [], []
+        self.completed = []
+        self.carry = np.zeros(self.num_codes)
+        self.points = np.zeros(self.num_codes)
+        self.completed_now = np.zeros(self.num_codes, dtype=np.int64)
+
+        self.sim = Simulation()
+        self.sim.on(SPRINT_BOUNDARY, self.on_sprint_boundary)
+        self.sim.on(BLOCKER_RAISED, self.on_blocker_raised)
+        self.sim.on(BLOCKER_RESOLVED, self.on_blocker_resolved)
+        self.sim.on(STANDUP, self.on_standup)
+        self.sim.on(DEPENDENCY_SATISFIED, self.on_dependency_satisfied)
+        self.sim.on(WORK_DONE, self.on_work_done)
+        for sprint in range(num_sprints + 1):
+            self.sim.schedule(sprint * sprint_days, SPRINT_BOUNDARY, [0], sprint)
+
+    @property
+    def days(self):
+        return self.num_sprints * self.sprint_days
+
+    def run(self, until=None):
+        """Simulate through day `until` (default the end of the PI)."""
+        self.sim.run(until=self.days if until is None else until)
+        return self
+
+    def satisfy(self, rows, day):
+        """Release one outside dependency of each row; rows with none left become ready on `day`."""
+        rows = np.asarray(rows, dtype=np.int64)
+        np.subtract.at(self.unmet, rows, 1)
+        self.sim.schedule(day, DEPENDENCY_SATISFIED, np.unique(rows[self.unmet[rows] == 0]))
+
+    def take_completed(self):
+        """Rows completed since the last call."""
+        done = np.concatenate(self.completed) if self.completed else np.empty(0, dtype=np.int64)
+        self.completed = []
+        return done
+
+    def result(self):
+        stats = self.sim.stats()
+        self.log.emit("pi_simulated", **stats)
+        return self.backlog, self.sprints, self.metrics, self.recommendations, stats
+
+    # Handlers ----------------------------------------------------------------
+    def close_sprint(self, sprint):
+        backlog, codes = self.backlog, self.codes
+        assigned = backlog.group_count(minlength=self.num_codes)
+        completed = backlog.group_count(rows=backlog.mask(status="Completed"), minlength=self.num_codes)
+        progress = [
+            {
+                "team": team['name'],
+                "progress": int(completed[code]),
+                "remaining": int(assigned[code] - completed[code]),
+                "completed": int(self.completed_now[code]),
+                "points": int(self.points[code]),
+                "planned": team['velocity']
+            }
+            for team, code in zip(self.teams, codes.tolist())
+        ]
+        self.sprints.append(progress)
+        self.history.update(progress)
+        if self.store is not None:
+            self.store.record_progress(progress, self.pi, sprint + 1)
+        self.log.emit("sprint_closed", sprint=sprint, day=self.sim.now, points=int(self.points[codes].sum()),
+                      completed=int(self.completed_now[codes].sum()), open_blockers=len(self.board))
+        self.points[:] = 0
+        self.completed_now[:] = 0
+
+    def open_sprint(self, sprint):
+        # The sprint's work per team is drawn like execute_sprint, then spread over its days
+        sim, rng = self.sim, self.rng
+        work = np.maximum(rng.integers(self.velocity - 2, self.velocity + 3), 0)
+        base, extra = np.divmod(work, self.sprint_days)
+        raised = rng.random((self.sprint_days, len(self.members))) < self.blocker_rate
+        low, high = self.blocker_days
+        for offset in range(self.sprint_days):
+            day = sim.now + offset
+            sim.schedule(day, STANDUP, [0])
+            sim.schedule(day, WORK_DONE, self.codes, base + (offset < extra))
+            who = np.flatnonzero(raised[offset])
+            sim.schedule(day, BLOCKER_RAISED, who, rng.integers(low, high + 1, size=len(who)))
+
+    def on_sprint_boundary(self, sim, targets, values):
+        sprint = int(values[0])
+        if sprint > 0:
+            self.close_sprint(sprint - 1)
+        if sprint < self.num_sprints:
+            self.open_sprint(sprint)
+        else:
+            self.metrics, self.recommendations = run_inspect_and_adapt(
+                self.teams, self.sprints[-1] if self.sprints else [], self.backlog, history=self.history,
+                rte=self.rte)
+
+    def on_blocker_raised(self, sim, targets, durations):
+        free = self.blocked_since[targets] == UNBLOCKED
+        targets, durations = targets[free], durations[free]
+        self.blocked_since[targets] = sim.now
+        for i in targets.tolist():
+            text = f"{self.members[i]['name']} blocked since day {sim.now}"
+            self.members[i]['blocker'] = text
+            self.by_blocker[(self.backlog.teams[self.member_team[i]], text)] = {i}
+        for duration in np.unique(durations).tolist():
+            resolved = targets[durations == duration]
+            sim.schedule(sim.now + duration, BLOCKER_RESOLVED, resolved, self.blocked_since[resolved])
+
+    def on_blocker_resolved(self, sim, targets, raised_on):
+        # An escalated blocker also has its own, now stale, resolution pending
+        for i in targets[self.blocked_since[targets] == raised_on].tolist():
+            text = self.members[i].pop('blocker', None)
+            self.by_blocker.pop((self.backlog.teams[self.member_team[i]], text), None)
+            self.blocked_since[i] = UNBLOCKED
+
+    def on_standup(self, sim, targets, values):
+        board = self.board
+        reported = run_daily_standup(self.teams, rte=self.rte, board=board, day=sim.now,
+                                     batch_size=self.escalations_per_day, log=self.log)
+        escalated = {
+            i
+            for item in reported if board.blockers[(item['team'], item['blocker'])].escalated_on == sim.now
+            for i in self.by_blocker.get((item['team'], item['blocker']), ())
+        }
+        if escalated:
+            escalated = np.fromiter(escalated, dtype=np.int64, count=len(escalated))
+            sim.schedule(sim.now + 1, BLOCKER_RESOLVED, escalated, self.blocked_since[escalated])
+
+    def on_dependency_satisfied(self, sim, targets, values):
+        self.ready[targets] = True
+
+    def on_work_done(self, sim, targets, work):
+        backlog, num_codes = self.backlog, self.num_codes
+        blocked = np.bincount(self.member_team[self.blocked_since != UNBLOCKED], minlength=num_codes)
+        available = np.divide(self.team_size - blocked, self.team_size, out=np.ones(num_codes),
+                              where=self.team_size > 0)
+        self.carry[targets] += work * available[targets]
+        spend = np.floor(self.carry)
+        self.carry -= spend
+
+        open_effort = backlog.group_sum("estimated_effort", rows=self.ready & (backlog.status != COMPLETED),
+                                        minlength=num_codes)
+        self.points += np.minimum(spend, open_effort)
+        done = backlog.burn_down_by_team(spend.astype(np.int64), ready=self.ready)
+        self.completed_now += np.bincount(backlog.assigned_team[done], minlength=num_codes)
+        if len(done):
+            self.completed.append(done)
+
+        # Work finished today unblocks its dependents from tomorrow
+        if len(done) and self.graph.num_edges:
+            _, waiting = self.graph.out_edges(done)
+            np.subtract.at(self.unmet, waiting, 1)
+            sim.schedule(sim.now + 1, DEPENDENCY_SATISFIED, np.unique(waiting[self.unmet[waiting] == 0]))
+
+
+def simulate_pi(backlog, teams, num_sprints=5, sprint_days=10, rng=None, blocker_rate=0.02, blocker_days=(1, 5),
+                escalations_per_day=3, rte=None, log=None, store=None):
+    """Run one PI day by day (see `PISimulation`).
+
+    Returns the backlog, a list of sprint_progress rows per sprint, the I&A
+    metrics and recommendations, and the kernel's event counts.
+    """
+    return PISimulation(backlog, teams, num_sprints=num_sprints, sprint_days=sprint_days, rng=rng,
+                        blocker_rate=blocker_rate, blocker_days=blocker_days,
+                        escalations_per_day=escalations_per_day, rte=rte, log=log, store=store).run().result()
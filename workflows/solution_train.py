@@ -0,0 +1,239 @@
+from multiprocessing import Pipe, Process
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.backlog import NO_DEPENDENCY, STATUSES, Backlog
+from utils.event_log import EventLog, get_event_log, set_event_log
+from workflows.pi_simulation import PISimulation
+
+COMPLETED = STATUSES.index("Completed")
+
+
+def assign_arts(backlog, num_arts):
+    # Contiguous blocks of the solution backlog, one per ART
+    return np.arange(len(backlog)) * num_arts // max(len(backlog), 1)
+
+
+def split_solution_backlog(backlog, arts, art_of):
+    """Cut the solution backlog into one backlog per ART.
+
+    Returns the solution rows of each ART, every row's index inside its
+    ART's backlog, the per-ART backlogs (unassigned, labelled with the ART's
+    teams) and the open cross-ART dependency edges as (upstream row,
+    downstream row) arrays of solution rows.
+    """
+    rows_of = [np.flatnonzero(art_of == a) for a in range(len(arts))]
+    local = np.empty(len(backlog), dtype=np.int64)
+    for rows in rows_of:
+        local[rows] = np.arange(len(rows))
+    backlogs = [
+        Backlog(**{column: backlog[column][rows] for column in Backlog.COLUMNS if column != "assigned_team"},
+                teams=[team['name'] for team in art['teams']])
+        for art, rows in zip(arts, rows_of)
+    ]
+
+    downstream = np.flatnonzero(backlog.depends_on != NO_DEPENDENCY)
+    upstream = backlog.index_of(backlog.depends_on[downstream])
+    known = upstream >= 0
+    upstream, downstream = upstream[known], downstream[known]
+    cross = (art_of[upstream] != art_of[downstream]) & (backlog.status[upstream] != COMPLETED)
+    return rows_of, local, backlogs, (upstream[cross], downstream[cross])
+
+
+class _Shard:
+    """The ARTs one worker simulates, stepped from sync point to sync point."""
+
+    def __init__(self, arts, log):
+        # arts: (index, PISimulation arguments, rows other ARTs depend on)
+        self.sims = {index: PISimulation(**kwargs, log=log) for index, kwargs, _ in arts}
+        self.exported = {index: exported for index, _, exported in arts}
+
+    def _satisfy(self, released, day):
+        for index, rows in released.items():
+            self.sims[index].satisfy(rows, day)
+
+    def step(self, until, released, day):
+        # Only the completed rows that other ARTs wait on go back, with a count of the rest
+        self._satisfy(released, day)
+        deltas = {}
+        for index, sim in self.sims.items():
+            done = sim.run(until).take_completed()
+            deltas[index] = (done[np.isin(done, self.exported[index])], len(done))
+        return deltas
+
+    def finish(self, released, day):
+        self._satisfy(released, day)
+        return {index: sim.run().result() for index, sim in self.sims.items()}
+
+
+def _serve(conn, arts, log_config):
+    try:
+        # The worker's own writer, also for events the workflows send to the default log
+        log = EventLog(**log_config)
+        set_event_log(log)
+        shard = _Shard(arts, log)
+        while True:
+            command, args = conn.recv()
+            conn.send(getattr(shard, command)(*args))
+            if command == "finish":
+                return
+    except Exception as e:
+        conn.send(e)
+    finally:
+        # Workers leave through os._exit, which skips the log's atexit close
+        get_event_log().close()
+        conn.close()
+
+
+class _LocalWorker:
+    def __init__(self, arts, log):
+        self.shard = _Shard(arts, log)
+        self.pending = None
+
+    def submit(self, command, *args):
+        self.pending = (command, args)
+
+    def result(self):
+        command, args = self.pending
+        return getattr(self.shard, command)(*args)
+
+    def close(self):
+        pass
+
+
+class _ProcessWorker:
+    def __init__(self, arts, log):
+        self.conn, child = Pipe()
+        self.process = Process(target=_serve, args=(child, arts, log.config), daemon=True)
+        self.process.start()
+        child.close()
+
+    def submit(self, command, *args):
+        self.conn.send((command, args))
+
+    def result(self):
+        reply = self.conn.recv()
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def close(self):
+        self.conn.close()
+        self.process.join()
+
+
+def simulate_solution_train(backlog, arts, art_of=None, num_sprints=5, sprint_days=10, sync_days=None,
+                            seed=None, workers=None, log=None, **options):
+    """Simulate several ARTs sharing a solution backlog, sharded over worker processes.
+
+    `arts` are {"name", "teams"} dicts and `art_of` gives the ART of every
+    backlog row (default: contiguous blocks). Each worker plans and runs its
+    ARTs' PIs locally (`PISimulation`, with `options` passed through); every
+    `sync_days` (default one sprint) the workers report which items other
+    ARTs wait on were completed, and the dependents are released from the
+    day after the sync, before the next segment runs (items released at the
+    last sync become ready on the PI's closing day). Nothing else crosses
+    process boundaries until the end, and each ART gets its own seed, so
+    results do not depend on `workers`.
+    The ARTs' events go to `log` as well; a worker process writes them
+    through its own log opened with `log.config`, so events of several
+    workers interleave by flush rather than by time.
+
+    Returns the solution backlog with every ART's progress merged in, a dict
+    of per-ART results (sprints, metrics, recommendations, stats) and one
+    row per ART and sync point.
+    """
+    log = log or get_event_log()
+    art_of = assign_arts(backlog, len(arts)) if art_of is None else np.asarray(art_of, dtype=np.int64)
+    rows_of, local, backlogs, (upstream, downstream) = split_solution_backlog(backlog, arts, art_of)
+    seeds = np.random.SeedSequence(seed).spawn(len(arts))
+    up_art, down_art = art_of[upstream], art_of[downstream]
+
+    specs = [
+        (a, {"backlog": backlogs[a], "teams": art['teams'], "num_sprints": num_sprints,
+             "sprint_days": sprint_days, "rng": seeds[a], "remote_waits": local[downstream[down_art == a]],
+             **options},
+         np.unique(local[upstream[up_art == a]]))
+        for a, art in enumerate(arts)
+    ]
+
+    # Largest ARTs first, each onto the least loaded worker
+    workers = max(1, min(workers or os.cpu_count() or 1, len(arts)))
+    shards, load = [[] for _ in range(workers)], [0] * workers
+    for spec in sorted(specs, key=lambda spec: -len(rows_of[spec[0]])):
+        w = load.index(min(load))
+        shards[w].append(spec)
+        load[w] += len(rows_of[spec[0]])
+    worker_of = {spec[0]: w for w, shard in enumerate(shards) for spec in shard}
+    pool = [_LocalWorker(shard, log) if workers == 1 else _ProcessWorker(shard, log) for shard in shards]
+
+    days = num_sprints * sprint_days
+    sync_days = sync_days or sprint_days
+    released = [{} for _ in pool]
+    syncs = []
+    previous = -1
+    try:
+        # The last sync is on the PI's last working day
+        for until in sorted(set(range(sync_days - 1, days, sync_days)) | {days - 1}):
+            # What the previous sync released becomes ready the day after it
+            for worker, batch in zip(pool, released):
+                worker.submit("step", until, batch, previous + 1)
+            deltas = {}
+            for worker in pool:
+                deltas.update(worker.result())
+
+            # Route completed upstream items to the ARTs waiting on them
+            done = np.concatenate([rows_of[a][rows] for a, (rows, _) in deltas.items()])
+            hit = np.isin(upstream, done)
+            released = [{} for _ in pool]
+            for a in np.unique(down_art[hit]).tolist():
+                released[worker_of[a]][a] = local[downstream[hit & (down_art == a)]]
+            upstream, downstream, up_art, down_art = upstream[~hit], downstream[~hit], up_art[~hit], down_art[~hit]
+
+            for a, (_, completed) in sorted(deltas.items()):
+                syncs.append({"day": until, "art": arts[a]['name'], "completed": completed,
+                              "released": len(released[worker_of[a]].get(a, ())),
+                              "waiting": int((down_art == a).sum())})
+            log.emit("solution_synced", day=until, completed=sum(c for _, c in deltas.values()),
+                     released=int(hit.sum()), waiting=len(downstream))
+            previous = until
+
+        for worker, batch in zip(pool, released):
+            worker.submit("finish", batch, previous + 1)
+        results = {}
+        for worker in pool:
+            results.update(worker.result())
+    finally:
+        for worker in pool:
+            worker.close()
+
+    # Fold every ART's backlog back into the solution backlog
+    train = {}
+    for a, (art_backlog, sprints, metrics, recommendations, stats) in sorted(results.items()):
+        rows = rows_of[a]
+        backlog.status[rows] = art_backlog.status
+        backlog.estimated_effort[rows] = art_backlog.estimated_effort
+        labels = np.asarray(art_backlog.teams + [None], dtype=object)[art_backlog.assigned_team]
+        backlog.assigned_team[rows] = backlog.team_codes(labels)
+        train[arts[a]['name']] = {"sprints": sprints, "metrics": metrics, "recommendations": recommendations,
+                                  "stats": stats}
+    return backlog, train, pd.DataFrame(syncs)
+
+
+if __name__ == "__main__":
+    from utils.generate_data import generate_backlog
+
+    num_arts, teams_per_art, items = 4, 10, 20_000
+    arts = [
+        {"name": f"ART {a + 1}", "teams": [
+            {"name": f"ART {a + 1} Team {t + 1}", "capacity": 2 * items // (num_arts * teams_per_art),
+             "velocity": 40, "members": [{"name": f"ART {a + 1} Member {t + 1}.{m + 1}"} for m in range(5)]}
+            for t in range(teams_per_art)
+        ]}
+        for a in range(num_arts)
+    ]
+    backlog = Backlog.from_frame(generate_backlog(items, seed=0, dependency_rate=0.2))
+    backlog, train, syncs = simulate_solution_train(backlog, arts, seed=0)
+    print(syncs.to_string())
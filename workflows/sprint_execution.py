@@ -1,26 +1,38 @@
-import random
+import numpy as np
 
-def execute_sprint(teams, backlog):
-    sprint_progress = []
+def execute_sprint(teams, backlog, rng=None, store=None, pi=1, sprint=1):
+    rng = np.random.default_rng(rng)
 
-    for team in teams:
-        velocity = team['velocity']
-        completed_work = random.randint(velocity - 2, velocity + 2)
+    # Every team's completed work for the sprint, drawn in one go
+    codes = np.asarray([backlog.team_code(team['name']) for team in teams], dtype=np.int64)
+    velocity = np.asarray([team['velocity'] for team in teams], dtype=np.int64)
+    work = np.zeros(len(backlog.teams), dtype=np.int64)
+    work[codes] = rng.integers(velocity - 2, velocity + 3)
 
-        # Update backlog items assigned to the team
-        assigned_items = [item for item in backlog if item['assigned_team'] == team['name']]
-        for item in assigned_items:
-            if item['estimated_effort'] <= completed_work:
-                item['status'] = "Completed"
-                completed_work -= item['estimated_effort']
-            else:
-                item['estimated_effort'] -= completed_work
-                completed_work = 0
+    # Teams cannot deliver more effort than is left in their queue
+    open_effort = backlog.group_sum("estimated_effort", rows=~backlog.mask(status="Completed"),
+                                    minlength=len(backlog.teams))
+    points = np.minimum(work, open_effort)
 
-        sprint_progress.append({
+    # Update backlog items of all teams in a single pass
+    done = backlog.burn_down_by_team(work)
+    completed_now = np.bincount(backlog.assigned_team[done], minlength=len(backlog.teams))
+
+    assigned = backlog.group_count(minlength=len(backlog.teams))
+    completed = backlog.group_count(rows=backlog.mask(status="Completed"), minlength=len(backlog.teams))
+    sprint_progress = [
+        {
             "team": team['name'],
-            "progress": sum(1 for i in assigned_items if i['status'] == "Completed"),
-            "remaining": sum(1 for i in assigned_items if i['status'] != "Completed")
-        })
+            "progress": int(completed[code]),
+            "remaining": int(assigned[code] - completed[code]),
+            "completed": int(completed_now[code]),
+            "points": int(points[code]),
+            "planned": team['velocity']
+        }
+        for team, code in zip(teams, codes.tolist())
+    ]
+
+    if store is not None:
+        store.record_progress(sprint_progress, pi, sprint)
 
-    return backlog, sprint_progress
\ No newline at end of file
+    return backlog, sprint_progress
@@ -0,0 +1,109 @@
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.backlog import Backlog
+from utils.database import MetricsStore
+from utils.event_log import EventLog
+from utils.generate_data import generate_backlog
+from workflows.inspect_adapt import run_inspect_and_adapt
+from workflows.pi_planning import run_pi_planning
+from workflows.sprint_execution import execute_sprint
+
+DEFAULTS = {
+    "num_teams": 2,
+    "velocity": 10,
+    "capacity": 30,
+    "dependency_rate": 0.0,
+    "backlog_size": 50,
+    "num_sprints": 1,
+}
+
+
+def sweep_grid(**values):
+    """Every combination of the given parameter values, e.g. velocity=[10, 20]."""
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(values[n] for n in names))]
+
+
+def sweep_random(n, seed=None, **ranges):
+    # Sample n configurations; a (low, high) tuple is a uniform range, a list is a choice
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, spec in ranges.items():
+        if isinstance(spec, tuple):
+            low, high = spec
+            if isinstance(low, int) and isinstance(high, int):
+                columns[name] = rng.integers(low, high + 1, size=n).tolist()
+            else:
+                columns[name] = rng.uniform(low, high, size=n).tolist()
+        else:
+            columns[name] = [spec[i] for i in rng.integers(0, len(spec), size=n)]
+    return [{name: columns[name][i] for name in ranges} for i in range(n)]
+
+
+def run_scenario(config, seed, metrics_db=None):
+    """Run PI planning -> sprints -> Inspect & Adapt for one configuration.
+
+    With `metrics_db`, the per-team planning and sprint metrics are written
+    there under run id "sweep-<seed>" in one batch.
+    """
+    params = {**DEFAULTS, **config}
+    rng = np.random.default_rng(seed)
+    teams = [
+        {"name": f"Team {i + 1}", "capacity": params["capacity"], "velocity": params["velocity"], "members": []}
+        for i in range(params["num_teams"])
+    ]
+    frame = generate_backlog(params["backlog_size"], seed=rng, dependency_rate=params["dependency_rate"])
+    backlog = Backlog.from_frame(frame, teams=[team['name'] for team in teams])
+
+    # Thousands of scenarios would only bury the event log; the returned row is the record
+    store = MetricsStore(f"sweep-{seed}", path=metrics_db) if metrics_db else None
+    backlog, teams, dependencies, board = run_pi_planning(backlog, teams, num_sprints=params["num_sprints"],
+                                                          log=EventLog(None), store=store)
+    progress = []
+    for sprint in range(params["num_sprints"]):
+        backlog, progress = execute_sprint(teams, backlog, rng=rng, store=store, sprint=sprint + 1)
+    metrics, recommendations = run_inspect_and_adapt(teams, progress, backlog)
+    if store is not None:
+        store.flush()
+
+    features = backlog.mask(type="Feature")
+    velocity = [metric['velocity'] for metric in metrics]
+    return {
+        **config,
+        "seed": seed,
+        "features": int(features.sum()),
+        "features_assigned": int((features & (backlog.assigned_team >= 0)).sum()),
+        "features_unscheduled": len(board.unscheduled),
+        "dependencies": len(dependencies),
+        "items_completed": int(backlog.mask(status="Completed").sum()),
+        "mean_velocity": float(np.mean(velocity)) if velocity else 0.0,
+        "recommendations": len(recommendations),
+    }
+
+
+def run_sweep(configs, seed=None, workers=None, metrics_db=None):
+    """Fan `run_scenario` out over a process pool and collect one row per config.
+
+    Each configuration gets its own seed spawned from `seed`, so results do
+    not depend on how the work is split across workers. `metrics_db` also
+    records every scenario's per-team metrics (see `run_scenario`).
+    """
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(configs))]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(configs) <= 1:
+        rows = [run_scenario(config, s, metrics_db) for config, s in zip(configs, seeds)]
+    else:
+        chunksize = max(1, len(configs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(run_scenario, configs, seeds, [metrics_db] * len(configs), chunksize=chunksize))
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    configs = sweep_grid(num_teams=[2, 5, 10], velocity=[10, 25, 50], dependency_rate=[0.0, 0.1, 0.3])
+    print(run_sweep(configs, seed=0).to_string())
@@ -0,0 +1,107 @@
+import json
+import re
+
+from utils.crew_dag import cached_run_task_dag
+
+# Fields the LLM fills in for every team, per ceremony
+CEREMONY_FIELDS = {
+    "standup": ("summary", "risks", "help_needed"),
+    "retro": ("went_well", "to_improve", "action_items"),
+}
+BATCH_SIZE = 10
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def team_ceremony_inputs(teams, blockers=None, progress=()):
+    """One compact record per team from its members, standup blockers and sprint progress."""
+    if blockers is None:
+        # Same rule as ScrumMaster.run_standup: members reporting a blocker
+        blockers = [
+            {"team": team['name'], "blocker": member['blocker']}
+            for team in teams for member in team.get("members", []) if "blocker" in member
+        ]
+    blockers_by_team, progress_by_team = {}, {}
+    for blocker in blockers:
+        blockers_by_team.setdefault(blocker['team'], []).append(blocker['blocker'])
+    for item in progress:
+        progress_by_team[item['team']] = {k: v for k, v in item.items() if k != "team"}
+    return [
+        {
+            "team": team['name'],
+            "members": [member.get("name") for member in team.get("members", [])],
+            "blockers": blockers_by_team.get(team['name'], []),
+            "progress": progress_by_team.get(team['name'], {}),
+        }
+        for team in teams
+    ]
+
+
+def batch_prompt(ceremony, records):
+    fields = CEREMONY_FIELDS[ceremony]
+    lines = "\n".join(json.dumps(record, default=str) for record in records)
+    return (
+        f"Facilitate the {ceremony} for each of the {len(records)} teams below, one JSON record per team.\n"
+        f"{lines}\n\n"
+        f"Answer with a single JSON object keyed by exact team name, where each value has the keys "
+        f"{', '.join(fields)}. Cover every team and nothing else."
+    )
+
+
+def parse_batch_output(raw, team_names, fields):
+    """Split a batched answer back into per-team outputs.
+
+    Returns {team: {field: value}} for the teams that could be recovered;
+    a reply that isn't valid JSON recovers none.
+    """
+    match = _JSON_OBJECT.search(raw or "")
+    if not match:
+        return {}
+    try:
+        parsed = json.loads(match.group(0))
+    except ValueError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+    return {
+        name: {field: parsed[name].get(field) for field in fields}
+        for name in team_names
+        if isinstance(parsed.get(name), dict)
+    }
+
+
+def run_batched_ceremony(ceremony, teams, agent, blockers=None, progress=(), batch_size=BATCH_SIZE,
+                         retries=1, **dag_options):
+    """Run a standup or retro for many teams with one LLM task per batch of teams.
+
+    `blockers` come from `run_daily_standup` (read from the team members when
+    omitted) and `progress` from `execute_sprint`. Batches are independent tasks run via
+    `cached_run_task_dag`, which takes the remaining options (bypass,
+    default_limit, ...). Teams missing from a reply are re-asked up to
+    `retries` times in batches half the previous size, since a long reply is
+    the likeliest to drop teams. Returns ({team: outputs}, missing team names).
+    """
+    from crewai import Task
+
+    fields = CEREMONY_FIELDS[ceremony]
+    pending = team_ceremony_inputs(teams, blockers, progress)
+    outputs = {}
+    for _ in range(retries + 1):
+        if not pending:
+            break
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        tasks = [
+            Task(
+                description=batch_prompt(ceremony, batch),
+                expected_output=f"JSON object mapping each team name to its {ceremony} outcome",
+                # Batches run concurrently and a crewai agent runs one task at a time
+                agent=agent.copy(),
+            )
+            for batch in batches
+        ]
+        results = cached_run_task_dag(tasks, **dag_options)
+        for batch, result in zip(batches, results["tasks"]):
+            outputs.update(parse_batch_output(result["result"], [r['team'] for r in batch], fields))
+        pending = [record for record in pending if record['team'] not in outputs]
+        batch_size = max(1, batch_size // 2)
+    return outputs, [record['team'] for record in pending]